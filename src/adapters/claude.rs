@@ -1,19 +1,70 @@
 use std::collections::HashMap;
 use std::fs;
-use std::io::{BufRead, BufReader};
 use std::path::{Path, PathBuf};
 
+use once_cell::sync::Lazy;
+use rayon::prelude::*;
+use regex::bytes::Regex;
+use serde::Deserialize;
 use serde_json::Value;
 
 use crate::config;
 use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp, truncate_title};
 
 use super::shared::{
-    IncrementalParse, build_resume_command, content_texts, incremental_parse_jsonl,
-    incremental_scan, parse_timestamp_seconds, raw_stats_for_tree, string_at, text_from_part,
+    IncrementalParse, build_resume_command, content_strs, incremental_parse_jsonl,
+    incremental_scan, is_dir_entry, jsonl_rows, parse_timestamp_seconds, part_str, push_message,
+    raw_stats_for_tree, str_at, string_at,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
+/// Every row the parser reads mentions one of these quoted type names, so rows
+/// without them (progress, snapshots, system events) skip JSON parsing.
+static USEFUL_ROW_RE: Lazy<Regex> =
+    Lazy::new(|| Regex::new(r#""(?:user|assistant|ai-title)""#).expect("valid regex"));
+
+/// The fields of a transcript row the parser reads. Deserializing into this
+/// skips everything else, notably `toolUseResult`, which repeats tool output
+/// that is already in the message content, without building values for it.
+/// Fields stay `Value` so a row with an unexpected type is read as before.
+#[derive(Deserialize)]
+struct ClaudeRow {
+    #[serde(rename = "type", default)]
+    kind: Value,
+    #[serde(default)]
+    cwd: Value,
+    #[serde(rename = "isMeta", default)]
+    is_meta: Value,
+    #[serde(default)]
+    message: Value,
+    #[serde(rename = "aiTitle", default)]
+    ai_title: Value,
+}
+
+impl ClaudeRow {
+    /// Typed decoding rejects a row that repeats a key, where a `Value` keeps
+    /// the last occurrence, so such rows are read through a `Value` instead.
+    fn parse(line: &[u8]) -> Option<Self> {
+        serde_json::from_slice(line).ok().or_else(|| {
+            let Value::Object(mut row) = serde_json::from_slice(line).ok()? else {
+                return None;
+            };
+            let mut take = |key: &str| row.remove(key).unwrap_or(Value::Null);
+            Some(Self {
+                kind: take("type"),
+                cwd: take("cwd"),
+                is_meta: take("isMeta"),
+                message: take("message"),
+                ai_title: take("aiTitle"),
+            })
+        })
+    }
+}
+
+/// Session files keyed by id with `(path, mtime)`, plus the titles recorded in
+/// each project's `sessions-index.json`, keyed by session id.
+type ClaudeFileScan = (HashMap<String, (PathBuf, f64)>, HashMap<String, String>);
+
 pub struct ClaudeAdapter {
     sessions_dir: PathBuf,
 }
@@ -32,11 +83,15 @@ impl ClaudeAdapter {
         known: &KnownSessions,
         on_session: Option<&mut SessionCallback<'_>>,
     ) -> IncrementalScan {
+        let (scanned, index_titles) = match self.scan_session_files() {
+            Some((files, index_titles)) => (Some((files, true)), index_titles),
+            None => (None, HashMap::new()),
+        };
         incremental_scan(
             self.name(),
             known,
-            self.scan_session_files().map(|files| (files, true)),
-            |path| self.parse_session_incremental(path),
+            scanned,
+            |path| self.parse_session_incremental(path, &index_titles),
             on_session,
         )
     }
@@ -46,121 +101,142 @@ impl ClaudeAdapter {
         Self { sessions_dir }
     }
 
-    fn parse_session(&self, path: &Path) -> Option<Session> {
-        let file = fs::File::open(path).ok()?;
+    fn parse_session(
+        &self,
+        path: &Path,
+        index_titles: &HashMap<String, String>,
+    ) -> Option<Session> {
+        let bytes = fs::read(path).ok()?;
         let mut directory = String::new();
         let mut first_user_message = String::new();
         let mut ai_title = String::new();
-        let mut messages = Vec::new();
+        let mut conversation = String::new();
         let mut turns = 0usize;
 
-        for line in BufReader::new(file).lines().map_while(Result::ok) {
-            if line.trim().is_empty() {
+        // Parse raw byte rows: serde_json validates UTF-8 inside strings as it
+        // parses, so a separate decode pass is wasted work, and one undecodable
+        // row must not end the scan for the rows after it.
+        for line in jsonl_rows(&bytes) {
+            if !USEFUL_ROW_RE.is_match(line) {
                 continue;
             }
-            let Ok(data) = serde_json::from_str::<Value>(&line) else {
+            let Some(mut row) = ClaudeRow::parse(line) else {
                 continue;
             };
-            let msg_type = data.get("type").and_then(Value::as_str).unwrap_or_default();
-
-            if msg_type == "user" {
-                if directory.is_empty() {
-                    directory = string_at(&data, &["cwd"]);
-                }
-                let content = data
-                    .pointer("/message/content")
-                    .cloned()
-                    .unwrap_or(Value::Null);
-                let mut is_human_input = false;
-                match content {
-                    Value::String(text) => {
-                        is_human_input = true;
-                        let is_meta = data.get("isMeta").and_then(Value::as_bool).unwrap_or(false);
-                        if !is_meta
-                            && !text.starts_with("<command")
-                            && !text.starts_with("<local-command")
-                        {
-                            messages.push(format!("» {text}"));
-                            if first_user_message.is_empty() && text.chars().count() > 10 {
-                                first_user_message = text;
-                            }
-                        }
+            match row.kind.as_str().unwrap_or_default() {
+                "user" => {
+                    if directory.is_empty() {
+                        directory = str_at(&row.cwd, &[]).to_string();
                     }
-                    Value::Array(parts) => {
-                        if parts
-                            .first()
-                            .and_then(|part| part.get("type"))
-                            .and_then(Value::as_str)
-                            == Some("text")
-                        {
+                    // The row is discarded after this, so move the content out
+                    // rather than deep-cloning it.
+                    let content = row
+                        .message
+                        .get_mut("content")
+                        .map(Value::take)
+                        .unwrap_or(Value::Null);
+                    let mut is_human_input = false;
+                    match content {
+                        Value::String(text) => {
                             is_human_input = true;
-                        }
-                        for part in parts {
-                            if let Some(text) = text_from_part(&part) {
-                                messages.push(format!("» {text}"));
-                                if first_user_message.is_empty() {
+                            let is_meta = row.is_meta.as_bool().unwrap_or(false);
+                            if !is_meta
+                                && !text.starts_with("<command")
+                                && !text.starts_with("<local-command")
+                            {
+                                push_message(&mut conversation, "» ", &text);
+                                if first_user_message.is_empty() && text.chars().count() > 10 {
                                     first_user_message = text;
                                 }
-                            } else if let Some(text) = part.as_str() {
-                                messages.push(format!("» {text}"));
                             }
                         }
+                        Value::Array(parts) => {
+                            if parts
+                                .first()
+                                .and_then(|part| part.get("type"))
+                                .and_then(Value::as_str)
+                                == Some("text")
+                            {
+                                is_human_input = true;
+                            }
+                            for part in parts {
+                                if let Some(text) = part_str(&part) {
+                                    push_message(&mut conversation, "» ", text);
+                                    if first_user_message.is_empty() {
+                                        first_user_message = text.to_string();
+                                    }
+                                } else if let Some(text) = part.as_str() {
+                                    push_message(&mut conversation, "» ", text);
+                                }
+                            }
+                        }
+                        _ => {}
+                    }
+                    if is_human_input {
+                        turns += 1;
                     }
-                    _ => {}
-                }
-                if is_human_input {
-                    turns += 1;
-                }
-            } else if msg_type == "assistant" {
-                let content = data
-                    .pointer("/message/content")
-                    .cloned()
-                    .unwrap_or(Value::Null);
-                let mut has_text = false;
-                for text in content_texts(&content) {
-                    messages.push(format!("  {text}"));
-                    has_text = true;
                 }
-                if has_text {
-                    turns += 1;
+                "assistant" => {
+                    let content = row.message.get("content").unwrap_or(&Value::Null);
+                    let mut has_text = false;
+                    for text in content_strs(content) {
+                        push_message(&mut conversation, "  ", text);
+                        has_text = true;
+                    }
+                    if has_text {
+                        turns += 1;
+                    }
                 }
-            } else if msg_type == "ai-title" {
-                let title = string_at(&data, &["aiTitle"]);
-                if !title.trim().is_empty() {
-                    ai_title = title;
+                "ai-title" => {
+                    let title = str_at(&row.ai_title, &[]);
+                    if !title.trim().is_empty() {
+                        ai_title = title.to_string();
+                    }
                 }
+                _ => {}
             }
         }
 
-        if first_user_message.is_empty() || messages.is_empty() {
+        if first_user_message.is_empty() || conversation.is_empty() {
             return None;
         }
 
-        let title_source = claude_index_title(path)
+        let session_id = path.file_stem()?.to_string_lossy();
+        let title_source = index_titles
+            .get(session_id.as_ref())
+            .cloned()
             .or_else(|| (!ai_title.is_empty()).then_some(ai_title))
             .unwrap_or(first_user_message);
         let title = truncate_title(&title_source, 100, true);
-        let mut session = Session::new(
-            path.file_stem()?.to_string_lossy(),
+        // Callers stamp the scan's mtime, which also covers index renames, so
+        // the file is not stat'ed again for it here.
+        Some(Session::new(
+            session_id,
             self.name(),
             title,
             directory,
             file_timestamp(path),
-            messages.join("\n\n"),
+            conversation,
             turns,
-        );
-        session.mtime = file_mtime_seconds(path);
-        Some(session)
+        ))
     }
 
-    fn parse_session_incremental(&self, path: &Path) -> IncrementalParse {
-        incremental_parse_jsonl(path, || self.parse_session(path))
+    fn parse_session_incremental(
+        &self,
+        path: &Path,
+        index_titles: &HashMap<String, String>,
+    ) -> IncrementalParse {
+        incremental_parse_jsonl(path, || self.parse_session(path, index_titles))
     }
 
-    fn scan_session_files(&self) -> Option<HashMap<String, (PathBuf, f64)>> {
+    /// List session files, reading each project's `sessions-index.json` once.
+    /// Parsing looks titles up in the returned map instead of re-reading the
+    /// project index for every changed session.
+    fn scan_session_files(&self) -> Option<ClaudeFileScan> {
         let mut current_files = HashMap::new();
+        let mut index_titles = HashMap::new();
         if !self.sessions_dir.exists() {
-            return Some(current_files);
+            return Some((current_files, index_titles));
         }
         if !self.sessions_dir.is_dir() {
             return None;
@@ -173,10 +249,10 @@ impl ClaudeAdapter {
             let Ok(project) = project else {
                 return None;
             };
-            let project_dir = project.path();
-            if !project_dir.is_dir() {
+            if !is_dir_entry(&project) {
                 continue;
             }
+            let project_dir = project.path();
             let project_index = claude_project_index(&project_dir);
             let Ok(files) = fs::read_dir(&project_dir) else {
                 return None;
@@ -185,33 +261,33 @@ impl ClaudeAdapter {
                 let Ok(file) = file else {
                     return None;
                 };
-                let path = file.path();
-                if path.extension().and_then(|e| e.to_str()) != Some("jsonl") {
-                    continue;
-                }
-                if path
-                    .file_name()
-                    .and_then(|name| name.to_str())
-                    .is_some_and(|name| name.starts_with("agent-"))
-                {
-                    continue;
-                }
-                let Some(session_id) = path
-                    .file_stem()
-                    .and_then(|stem| stem.to_str())
+                let name = file.file_name();
+                let Some(session_id) = name
+                    .to_str()
+                    .and_then(|name| name.strip_suffix(".jsonl"))
+                    .filter(|stem| !stem.is_empty() && !stem.starts_with("agent-"))
                     .map(ToString::to_string)
                 else {
                     continue;
                 };
+                let path = file.path();
+                // Each file is stat'ed even when its project directory's mtime
+                // is unchanged: appending to a session does not touch the
+                // directory, so skipping by directory mtime would hide updates.
+                // The title follows the file that is kept, so an id repeated
+                // in a later project never keeps an earlier project's title.
                 let mut mtime = file_mtime_seconds(&path);
-                if let Some((_, index_mtime)) = project_index.get(&session_id) {
+                if let Some((title, index_mtime)) = project_index.get(&session_id) {
                     mtime = mtime.max(*index_mtime);
+                    index_titles.insert(session_id.clone(), title.clone());
+                } else {
+                    index_titles.remove(&session_id);
                 }
                 current_files.insert(session_id, (path, mtime));
             }
         }
 
-        Some(current_files)
+        Some((current_files, index_titles))
     }
 }
 
@@ -225,13 +301,13 @@ impl Adapter for ClaudeAdapter {
     }
 
     fn find_sessions(&self) -> Vec<Session> {
-        let Some(current_files) = self.scan_session_files() else {
+        let Some((current_files, index_titles)) = self.scan_session_files() else {
             return Vec::new();
         };
         current_files
-            .into_values()
-            .filter_map(|(path, mtime)| {
-                let mut session = self.parse_session(&path)?;
+            .into_par_iter()
+            .filter_map(|(_, (path, mtime))| {
+                let mut session = self.parse_session(&path, &index_titles)?;
                 session.mtime = mtime;
                 Some(session)
             })
@@ -265,13 +341,6 @@ impl Adapter for ClaudeAdapter {
     }
 }
 
-fn claude_index_title(session_file: &Path) -> Option<String> {
-    let session_id = session_file.file_stem()?.to_string_lossy();
-    claude_project_index(session_file.parent()?)
-        .get(session_id.as_ref())
-        .map(|(title, _)| title.clone())
-}
-
 fn claude_project_index(project_dir: &Path) -> HashMap<String, (String, f64)> {
     let mut titles = HashMap::new();
     let index_file = project_dir.join("sessions-index.json");
@@ -391,6 +460,61 @@ mod tests {
         assert_eq!(sessions[0].directory, "/work/app");
     }
 
+    #[test]
+    fn repeated_session_id_takes_its_title_from_the_kept_project() {
+        let temp = tempdir().unwrap();
+        let projects = temp.path().join("projects");
+        // Each project indexes a title for a different one of the two ids, so
+        // whichever order the projects are listed in, one kept copy comes
+        // from a project without a title for it.
+        for (project, cwd, titled) in [
+            ("project-a", "/work/a", "first-id"),
+            ("project-b", "/work/b", "second-id"),
+        ] {
+            let project = projects.join(project);
+            fs::create_dir_all(&project).unwrap();
+            for id in ["first-id", "second-id"] {
+                fs::write(
+                    project.join(format!("{id}.jsonl")),
+                    json!({
+                        "type": "user",
+                        "cwd": cwd,
+                        "message": {"content": "First prompt of a copied session"}
+                    })
+                    .to_string(),
+                )
+                .unwrap();
+            }
+            fs::write(
+                project.join("sessions-index.json"),
+                json!({
+                    "version": 1,
+                    "entries": [{
+                        "sessionId": titled,
+                        "summary": format!("Title from {cwd}")
+                    }]
+                })
+                .to_string(),
+            )
+            .unwrap();
+        }
+
+        let adapter = ClaudeAdapter::new(projects);
+        let sessions = adapter.find_sessions();
+
+        assert_eq!(sessions.len(), 2);
+        for session in sessions {
+            assert!(
+                !session.title.starts_with("Title from")
+                    || session.title == format!("Title from {}", session.directory),
+                "{} kept {:?} with title {:?}",
+                session.id,
+                session.directory,
+                session.title
+            );
+        }
+    }
+
     #[test]
     fn uses_ai_title_before_first_user_message() {
         let temp = tempdir().unwrap();
@@ -530,6 +654,106 @@ mod tests {
         assert!(scan.deleted_ids.is_empty());
     }
 
+    #[test]
+    fn parses_rows_with_spaced_json() {
+        let temp = tempdir().unwrap();
+        let projects = temp.path().join("projects");
+        let project = projects.join("project-a");
+        fs::create_dir_all(&project).unwrap();
+        fs::write(
+            project.join("spaced.jsonl"),
+            [
+                r#"{"type": "progress", "data": {"step": 1}}"#,
+                r#"{"type": "user", "cwd": "/work/app", "message": {"content": "Prompt in spaced JSON"}}"#,
+                r#"{"type": "assistant", "message": {"content": "Spaced response"}}"#,
+            ]
+            .join("\n"),
+        )
+        .unwrap();
+
+        let sessions = ClaudeAdapter::new(projects).find_sessions();
+
+        assert_eq!(sessions.len(), 1);
+        assert_eq!(sessions[0].directory, "/work/app");
+        assert!(sessions[0].content.contains("Spaced response"));
+    }
+
+    #[test]
+    fn reads_rows_with_repeated_keys_keeping_the_last_value() {
+        let temp = tempdir().unwrap();
+        let projects = temp.path().join("projects");
+        let project = projects.join("project-a");
+        fs::create_dir_all(&project).unwrap();
+        fs::write(
+            project.join("repeated.jsonl"),
+            [
+                r#"{"type":"user","cwd":"/old","cwd":"/work/app","message":{"content":"Prompt with a repeated key"}}"#,
+                r#"{"type":"assistant","message":{"content":"Stale"},"message":{"content":"Latest response"}}"#,
+            ]
+            .join("\n"),
+        )
+        .unwrap();
+
+        let sessions = ClaudeAdapter::new(projects).find_sessions();
+
+        assert_eq!(sessions.len(), 1);
+        assert_eq!(sessions[0].directory, "/work/app");
+        assert!(sessions[0].content.contains("Latest response"));
+        assert!(!sessions[0].content.contains("Stale"));
+    }
+
+    #[test]
+    fn reads_rows_with_tool_results_and_unexpected_field_types() {
+        let temp = tempdir().unwrap();
+        let projects = temp.path().join("projects");
+        let project = projects.join("project-a");
+        fs::create_dir_all(&project).unwrap();
+        fs::write(
+            project.join("tool-result.jsonl"),
+            [
+                r#"{"type": "user", "cwd": null, "isMeta": "no", "message": {"content": "Run the test suite"}}"#,
+                r#"{"type": "user", "cwd": "/work/app", "toolUseResult": {"stdout": "ok", "lines": [1, 2]}, "message": {"content": [{"type": "tool_result", "content": "ok"}]}}"#,
+                r#"{"type": "assistant", "message": {"content": [{"type": "text", "text": "All green"}]}}"#,
+            ]
+            .join("\n"),
+        )
+        .unwrap();
+
+        let sessions = ClaudeAdapter::new(projects).find_sessions();
+
+        assert_eq!(sessions.len(), 1);
+        assert_eq!(sessions[0].title, "Run the test suite");
+        assert_eq!(sessions[0].directory, "/work/app");
+        assert!(sessions[0].content.contains("All green"));
+    }
+
+    #[test]
+    fn skips_undecodable_rows_without_dropping_later_rows() {
+        let temp = tempdir().unwrap();
+        let projects = temp.path().join("projects");
+        let project = projects.join("project-a");
+        fs::create_dir_all(&project).unwrap();
+        let mut data = json!({
+            "type": "user",
+            "cwd": "/work/app",
+            "message": {"content": "Prompt before an undecodable row"}
+        })
+        .to_string()
+        .into_bytes();
+        data.extend_from_slice(b"\n{\"type\":\"user\",\"message\":{\"content\":\"\xff\"}}\n");
+        data.extend_from_slice(
+            json!({"type": "assistant", "message": {"content": "Response after it"}})
+                .to_string()
+                .as_bytes(),
+        );
+        fs::write(project.join("binary-row.jsonl"), data).unwrap();
+
+        let sessions = ClaudeAdapter::new(projects).find_sessions();
+
+        assert_eq!(sessions.len(), 1);
+        assert!(sessions[0].content.contains("Response after it"));
+    }
+
     #[test]
     fn incremental_read_dir_errors_do_not_delete_known_sessions() {
         let temp = tempdir().unwrap();
@@ -3,6 +3,9 @@ use std::fs;
 use std::io::{BufRead, BufReader};
 use std::path::{Path, PathBuf};
 
+use once_cell::sync::Lazy;
+use rayon::prelude::*;
+use regex::bytes::Regex;
 use serde_json::Value;
 use walkdir::WalkDir;
 
@@ -10,12 +13,20 @@ use crate::config;
 use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp, truncate_title};
 
 use super::shared::{
-    SessionFileScan, build_resume_command, codex_session_id_from_path, content_texts,
-    fallback_session_id, incremental_parse_jsonl, incremental_scan, parse_timestamp_seconds,
-    raw_stats_for_tree, string_at,
+    SessionFileScan, build_resume_command, codex_session_id_from_path, content_strs,
+    fallback_session_id, incremental_parse_jsonl, incremental_scan, jsonl_rows,
+    parse_timestamp_seconds, push_message, raw_stats_for_tree, str_at, string_at, visit_jsonl_rows,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
+/// Every row the parser reads mentions one of these quoted values: a record
+/// type it keeps, an event type, or a message role. Token counts and tool
+/// calls match none of them and skip JSON parsing.
+static USEFUL_ROW_RE: Lazy<Regex> = Lazy::new(|| {
+    Regex::new(r#""(?:session_meta|turn_context|user_message|agent_reasoning|user|assistant)""#)
+        .expect("valid regex")
+});
+
 #[derive(Debug, Clone)]
 pub struct CodexAdapter {
     sessions_dir: PathBuf,
@@ -60,25 +71,24 @@ impl CodexAdapter {
         path: &Path,
         thread_names: &HashMap<String, String>,
     ) -> Option<Session> {
-        let file = fs::File::open(path).ok()?;
+        let bytes = fs::read(path).ok()?;
         let mut session_id = codex_session_id_from_path(path).unwrap_or_default();
         let mut directory = String::new();
-        let mut messages = Vec::new();
+        let mut conversation = String::new();
         let mut user_prompts = Vec::new();
         let mut turns = 0usize;
         let mut yolo = false;
 
-        for line in BufReader::new(file).lines().map_while(Result::ok) {
-            if line.trim().is_empty() {
+        for line in jsonl_rows(&bytes) {
+            if !USEFUL_ROW_RE.is_match(line) {
                 continue;
             }
-            let Ok(data) = serde_json::from_str::<Value>(&line) else {
+            let Ok(data) = serde_json::from_slice::<Value>(line) else {
                 continue;
             };
-            let msg_type = string_at(&data, &["type"]);
             let payload = data.get("payload").unwrap_or(&Value::Null);
 
-            match msg_type.as_str() {
+            match str_at(&data, &["type"]) {
                 "session_meta" => {
                     if session_id.is_empty() {
                         session_id = string_at(payload, &["id"]);
@@ -88,33 +98,30 @@ impl CodexAdapter {
                     }
                 }
                 "turn_context" => {
-                    let approval = string_at(payload, &["approval_policy"]);
-                    let sandbox_mode = payload
-                        .pointer("/sandbox_policy/mode")
-                        .and_then(Value::as_str)
-                        .unwrap_or_default();
+                    let approval = str_at(payload, &["approval_policy"]);
+                    let sandbox_mode = str_at(payload, &["sandbox_policy", "mode"]);
                     if approval == "never" || sandbox_mode == "danger-full-access" {
                         yolo = true;
                     }
                 }
                 "response_item" => {
-                    let role = string_at(payload, &["role"]);
+                    let role = str_at(payload, &["role"]);
                     if role == "user" || role == "assistant" {
                         let role_prefix = if role == "user" { "» " } else { "  " };
                         if let Some(content) = payload.get("content") {
-                            for text in content_texts(content) {
+                            for text in content_strs(content) {
                                 if !text.trim_start().starts_with("<environment_context>") {
-                                    messages.push(format!("{role_prefix}{text}"));
+                                    push_message(&mut conversation, role_prefix, text);
                                 }
                             }
                         }
                     }
                 }
-                "event_msg" => match string_at(payload, &["type"]).as_str() {
+                "event_msg" => match str_at(payload, &["type"]) {
                     "user_message" => {
                         let message = string_at(payload, &["message"]);
                         if !message.is_empty() {
-                            messages.push(format!("» {message}"));
+                            push_message(&mut conversation, "» ", &message);
                             user_prompts.push(message);
                             turns += 1;
                         }
@@ -122,7 +129,7 @@ impl CodexAdapter {
                     "agent_reasoning" => {
                         let text = string_at(payload, &["text"]);
                         if !text.is_empty() {
-                            messages.push(format!("  {text}"));
+                            push_message(&mut conversation, "  ", &text);
                         }
                     }
                     _ => {}
@@ -148,10 +155,11 @@ impl CodexAdapter {
             truncate_title(&title_source, 80, false),
             directory,
             file_timestamp(path),
-            messages.join("\n\n"),
+            conversation,
             turns,
         );
-        session.mtime = file_mtime_seconds(path);
+        // Callers stamp the scan's mtime, which also covers thread renames, so
+        // the file is not stat'ed again for it here.
         session.yolo = yolo;
         Some(session)
     }
@@ -191,24 +199,26 @@ impl CodexAdapter {
         if let Some(session_id) = codex_session_id_from_path(path) {
             return session_id;
         }
+        let mut session_id = None;
         if let Ok(file) = fs::File::open(path) {
-            for line in BufReader::new(file).lines().map_while(Result::ok) {
-                if line.trim().is_empty() {
-                    continue;
+            // Only the session_meta row matters here, so other rows (which
+            // can be large tool outputs) are skipped without parsing them.
+            let _ = visit_jsonl_rows(BufReader::new(file), |row| {
+                if !std::str::from_utf8(row).is_ok_and(|row| row.contains("session_meta")) {
+                    return true;
                 }
-                let Ok(data) = serde_json::from_str::<Value>(&line) else {
-                    continue;
+                let Ok(data) = serde_json::from_slice::<Value>(row) else {
+                    return true;
                 };
-                if string_at(&data, &["type"]) == "session_meta" {
-                    let id = string_at(data.get("payload").unwrap_or(&Value::Null), &["id"]);
-                    if !id.is_empty() {
-                        return id;
-                    }
-                    break;
+                if str_at(&data, &["type"]) != "session_meta" {
+                    return true;
                 }
-            }
+                let id = str_at(&data, &["payload", "id"]);
+                session_id = (!id.is_empty()).then(|| id.to_string());
+                false
+            });
         }
-        fallback_session_id(path)
+        session_id.unwrap_or_else(|| fallback_session_id(path))
     }
 
     fn scan_session_files(&self) -> Option<SessionFileScan> {
@@ -222,13 +232,18 @@ impl CodexAdapter {
         }
 
         let thread_index = self.load_thread_index();
+        // Sessions live under YYYY/MM/DD by creation date, but resuming a
+        // session appends to its original file, so old day directories cannot
+        // be pruned; unchanged files are skipped later by mtime instead.
         for entry in WalkDir::new(&self.sessions_dir) {
             let Ok(entry) = entry else {
                 complete = false;
                 continue;
             };
             let path = entry.path();
-            if path.extension().and_then(|e| e.to_str()) != Some("jsonl") {
+            if entry.file_type().is_dir()
+                || path.extension().and_then(|e| e.to_str()) != Some("jsonl")
+            {
                 continue;
             }
             let session_id = self.session_id_from_file(path);
@@ -257,8 +272,8 @@ impl Adapter for CodexAdapter {
         };
         let thread_names = self.load_thread_names();
         current_files
-            .into_values()
-            .filter_map(|(path, mtime)| {
+            .into_par_iter()
+            .filter_map(|(_, (path, mtime))| {
                 let mut session = self.parse_session(&path, &thread_names)?;
                 session.mtime = mtime;
                 Some(session)
@@ -457,6 +472,24 @@ mod tests {
         assert_eq!(scan.deleted_ids.len(), 0);
     }
 
+    #[test]
+    fn reads_id_from_session_meta_when_the_file_name_has_none() {
+        let temp = tempdir().unwrap();
+        let sessions_dir = temp.path().join("sessions");
+        fs::create_dir_all(&sessions_dir).unwrap();
+        let session_file = sessions_dir.join("imported.jsonl");
+        write_jsonl(
+            &session_file,
+            &[
+                json!({"type": "event_msg", "payload": {"type": "token_count"}}),
+                json!({"type": "session_meta", "payload": {"id": "meta-id", "cwd": "/work"}}),
+            ],
+        );
+
+        let adapter = CodexAdapter::new(sessions_dir, temp.path().join("session_index.jsonl"));
+        assert_eq!(adapter.session_id_from_file(&session_file), "meta-id");
+    }
+
     #[test]
     fn incremental_uses_session_index_mtime() {
         let temp = tempdir().unwrap();
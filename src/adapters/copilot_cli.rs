@@ -1,9 +1,11 @@
 use std::collections::HashMap;
 use std::fs;
-use std::io::{BufRead, BufReader};
+use std::io::BufReader;
 use std::path::{Path, PathBuf};
 
-use regex::Regex;
+use once_cell::sync::Lazy;
+use rayon::prelude::*;
+use regex::bytes::Regex;
 use serde_json::Value;
 use walkdir::WalkDir;
 
@@ -12,10 +14,20 @@ use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp,
 
 use super::shared::{
     IncrementalParse, SessionFileScan, build_resume_command, copilot_fallback_session_id,
-    incremental_parse_jsonl, incremental_scan, raw_stats_for_tree, string_at,
+    incremental_parse_jsonl, incremental_scan, jsonl_rows, push_message, raw_stats_for_tree,
+    session_needs_update, str_at, string_at, visit_jsonl_rows,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
+/// Every event the parser reads has one of these types. Tool execution and
+/// other log events match none of them and skip JSON parsing.
+static USEFUL_ROW_RE: Lazy<Regex> = Lazy::new(|| {
+    Regex::new(
+        r#""(?:session\.start|session\.info|session\.title_changed|user\.message|assistant\.message)""#,
+    )
+    .expect("valid regex")
+});
+
 #[derive(Debug, Clone)]
 pub struct CopilotCliAdapter {
     sessions_dir: PathBuf,
@@ -39,14 +51,16 @@ impl Adapter for CopilotCliAdapter {
     }
 
     fn find_sessions(&self) -> Vec<Session> {
-        if !self.sessions_dir.exists() {
-            return Vec::new();
-        }
-        WalkDir::new(&self.sessions_dir)
+        // A missing directory surfaces as a walk error and yields no paths.
+        let paths: Vec<_> = WalkDir::new(&self.sessions_dir)
             .into_iter()
             .filter_map(Result::ok)
             .filter(|entry| entry.path().extension().and_then(|e| e.to_str()) == Some("jsonl"))
-            .filter_map(|entry| self.parse_session(entry.path()))
+            .map(walkdir::DirEntry::into_path)
+            .collect();
+        paths
+            .into_par_iter()
+            .filter_map(|path| self.parse_session(&path))
             .collect()
     }
 
@@ -80,80 +94,111 @@ impl CopilotCliAdapter {
         incremental_scan(
             self.name(),
             known,
-            self.scan_session_files(),
+            self.scan_session_files(known),
             |path| self.parse_session_incremental(path),
             on_session,
         )
     }
 
-    fn scan_session_files(&self) -> Option<SessionFileScan> {
+    fn scan_session_files(&self, known: &KnownSessions) -> Option<SessionFileScan> {
         let mut current_files = HashMap::new();
         let mut complete = true;
-        if !self.sessions_dir.exists() {
-            return Some((current_files, complete));
-        }
-        if !self.sessions_dir.is_dir() {
-            return None;
+        // One stat answers both "missing" and "not a directory".
+        match fs::metadata(&self.sessions_dir) {
+            Err(_) => return Some((current_files, complete)),
+            Ok(metadata) if !metadata.is_dir() => return None,
+            Ok(_) => {}
         }
 
+        let mut paths = Vec::new();
         for entry in WalkDir::new(&self.sessions_dir) {
             let Ok(entry) = entry else {
                 return None;
             };
-            let path = entry.path();
-            if path.extension().and_then(|e| e.to_str()) != Some("jsonl") {
-                continue;
+            if entry.path().extension().and_then(|e| e.to_str()) == Some("jsonl") {
+                paths.push(entry.into_path());
             }
-            let Some(session_id) = self.session_id_from_file(path) else {
+        }
+
+        // Resolving an id opens each file and reads its first rows. Those
+        // reads and the mtime stats are independent, so they overlap across
+        // files; results keep walk order so duplicate ids resolve as before.
+        let resolved: Vec<_> = paths
+            .into_par_iter()
+            .map(|path| {
+                let mtime = file_mtime_seconds(&path);
+                let session_id = self
+                    .unchanged_session_id(known, &path, mtime)
+                    .or_else(|| self.session_id_from_file(&path));
+                (session_id, path, mtime)
+            })
+            .collect();
+        for (session_id, path, mtime) in resolved {
+            let Some(session_id) = session_id else {
                 complete = false;
                 continue;
             };
-            current_files.insert(session_id, (path.to_path_buf(), file_mtime_seconds(path)));
+            current_files.insert(session_id, (path, mtime));
         }
         Some((current_files, complete))
     }
 
+    /// Returns the path-derived id when the index already holds it at this
+    /// file's mtime, so unchanged files are not reopened on every refresh.
+    /// Files whose embedded id differs from their path are always read.
+    fn unchanged_session_id(
+        &self,
+        known: &KnownSessions,
+        path: &Path,
+        mtime: f64,
+    ) -> Option<String> {
+        let session_id = copilot_fallback_session_id(path, &self.sessions_dir);
+        (!session_id.is_empty() && !session_needs_update(known, self.name(), &session_id, mtime))
+            .then_some(session_id)
+    }
+
     fn session_id_from_file(&self, path: &Path) -> Option<String> {
         let file = fs::File::open(path).ok()?;
+        let mut session_id = None;
         let mut complete = true;
-        for line in BufReader::new(file).lines() {
-            let Ok(line) = line else {
+        // The id is the first session.start that carries one, as in
+        // parse_session. Copilot writes that event first, so the read usually
+        // stops at the first row. Malformed rows before it (such as a
+        // partially written header) leave the identity uncertain.
+        let read = visit_jsonl_rows(BufReader::new(file), |row| {
+            let Ok(entry) = serde_json::from_slice::<Value>(row) else {
                 complete = false;
-                continue;
+                return true;
             };
-            if line.trim().is_empty() {
-                continue;
+            if str_at(&entry, &["type"]) != "session.start" {
+                return true;
             }
-            let Ok(entry) = serde_json::from_str::<Value>(&line) else {
-                complete = false;
-                continue;
-            };
-            if string_at(&entry, &["type"]) == "session.start" {
-                let id = string_at(entry.get("data").unwrap_or(&Value::Null), &["sessionId"]);
-                if !id.is_empty() {
-                    return Some(id);
-                }
-                break;
+            let id = string_at(entry.get("data").unwrap_or(&Value::Null), &["sessionId"]);
+            if id.is_empty() {
+                return true;
             }
-        }
-        complete.then(|| copilot_fallback_session_id(path, &self.sessions_dir))
+            session_id = Some(id);
+            false
+        });
+        complete &= read.is_ok();
+        session_id
+            .or_else(|| complete.then(|| copilot_fallback_session_id(path, &self.sessions_dir)))
     }
 
     fn parse_session(&self, path: &Path) -> Option<Session> {
-        let file = fs::File::open(path).ok()?;
-        let mut session_id = copilot_fallback_session_id(path, &self.sessions_dir);
+        let bytes = fs::read(path).ok()?;
+        let mut embedded_id = None;
         let mut directory = String::new();
         let mut first_user_message = String::new();
         let mut session_title = String::new();
-        let mut messages = Vec::new();
+        let mut conversation = String::new();
         let mut turns = 0usize;
-        let folder_re = Regex::new(r"Folder (/[^\s]+)").ok()?;
 
-        for line in BufReader::new(file).lines().map_while(Result::ok) {
-            if line.trim().is_empty() {
+        for line in jsonl_rows(&bytes) {
+            if !USEFUL_ROW_RE.is_match(line) {
                 continue;
             }
-            let Ok(entry) = serde_json::from_str::<Value>(&line) else {
+            let Ok(entry) = serde_json::from_slice::<Value>(line) else {
                 continue;
             };
             let msg_type = string_at(&entry, &["type"]);
@@ -162,19 +207,18 @@ impl CopilotCliAdapter {
             match msg_type.as_str() {
                 "session.start" => {
                     let id = string_at(data, &["sessionId"]);
-                    if !id.is_empty() {
-                        session_id = id;
+                    if embedded_id.is_none() && !id.is_empty() {
+                        embedded_id = Some(id);
                     }
                     if directory.is_empty() {
                         directory = string_at(data, &["context", "cwd"]);
                     }
                 }
                 "session.info" if directory.is_empty() => {
-                    if string_at(data, &["infoType"]) == "folder_trust" {
-                        let message = string_at(data, &["message"]);
-                        if let Some(caps) = folder_re.captures(&message) {
-                            directory = caps[1].to_string();
-                        }
+                    if str_at(data, &["infoType"]) == "folder_trust"
+                        && let Some(folder) = trusted_folder(str_at(data, &["message"]))
+                    {
+                        directory = folder.to_string();
                     }
                 }
                 "session.title_changed" => {
@@ -186,7 +230,7 @@ impl CopilotCliAdapter {
                 "user.message" => {
                     let content = string_at(data, &["content"]);
                     if !content.is_empty() {
-                        messages.push(format!("» {content}"));
+                        push_message(&mut conversation, "» ", &content);
                         turns += 1;
                         if first_user_message.is_empty() && content.chars().count() > 10 {
                             first_user_message = content;
@@ -196,7 +240,7 @@ impl CopilotCliAdapter {
                 "assistant.message" => {
                     let content = string_at(data, &["content"]);
                     if !content.is_empty() {
-                        messages.push(format!("  {content}"));
+                        push_message(&mut conversation, "  ", &content);
                         turns += 1;
                     }
                 }
@@ -204,7 +248,7 @@ impl CopilotCliAdapter {
             }
         }
 
-        if first_user_message.is_empty() || messages.is_empty() {
+        if first_user_message.is_empty() || conversation.is_empty() {
             return None;
         }
 
@@ -217,13 +261,15 @@ impl CopilotCliAdapter {
             100,
             true,
         );
+        let session_id =
+            embedded_id.unwrap_or_else(|| copilot_fallback_session_id(path, &self.sessions_dir));
         let mut session = Session::new(
             session_id,
             self.name(),
             title,
             directory,
             file_timestamp(path),
-            messages.join("\n\n"),
+            conversation,
             turns,
         );
         session.mtime = file_mtime_seconds(path);
@@ -235,6 +281,17 @@ impl CopilotCliAdapter {
     }
 }
 
+/// The absolute path in a folder trust message such as
+/// "Folder /work/app has been added to trusted folders.": the first
+/// "Folder /" followed by at least one more non-whitespace character.
+fn trusted_folder(message: &str) -> Option<&str> {
+    message.match_indices("Folder /").find_map(|(idx, _)| {
+        let rest = &message[idx + "Folder ".len()..];
+        let end = rest.find(char::is_whitespace).unwrap_or(rest.len());
+        (end > 1).then(|| &rest[..end])
+    })
+}
+
 #[cfg(test)]
 mod tests {
     use std::fs;
@@ -258,6 +315,24 @@ mod tests {
         .unwrap();
     }
 
+    #[test]
+    fn extracts_trusted_folder_from_message() {
+        assert_eq!(
+            trusted_folder("Folder /work/app has been added to trusted folders."),
+            Some("/work/app")
+        );
+        assert_eq!(
+            trusted_folder("Trusted: Folder /work/app\tnow"),
+            Some("/work/app")
+        );
+        assert_eq!(trusted_folder("Folder /"), None);
+        assert_eq!(
+            trusted_folder("Folder / is not a path, Folder /work/app is"),
+            Some("/work/app")
+        );
+        assert_eq!(trusted_folder("Folder work/app"), None);
+    }
+
     #[test]
     fn parses_session_and_yolo_resume_command() {
         let temp = tempdir().unwrap();
@@ -393,4 +468,69 @@ mod tests {
         assert!(streamed.is_empty());
         assert!(streaming_scan.deleted_ids.is_empty());
     }
+
+    #[test]
+    fn late_session_start_keys_the_scan_and_the_session_alike() {
+        let temp = tempdir().unwrap();
+        let sessions_dir = temp.path().join("sessions");
+        fs::create_dir_all(&sessions_dir).unwrap();
+        write_jsonl(
+            &sessions_dir.join("filename-id.jsonl"),
+            &[
+                json!({"type": "session.info", "data": {"infoType": "model"}}),
+                json!({"type": "session.start", "data": {"sessionId": "embedded-id"}}),
+                json!({"type": "user.message", "data": {"content": "Prompt after a late start"}}),
+                json!({"type": "assistant.message", "data": {"content": "Done"}}),
+            ],
+        );
+        let adapter = CopilotCliAdapter { sessions_dir };
+
+        let first_scan = adapter.find_sessions_incremental(&KnownSessions::new());
+        assert_eq!(first_scan.new_or_modified.len(), 1);
+        assert_eq!(first_scan.new_or_modified[0].id, "embedded-id");
+        let known: KnownSessions = first_scan
+            .new_or_modified
+            .iter()
+            .map(|session| {
+                (
+                    ("copilot-cli".to_string(), session.id.clone()),
+                    session.mtime,
+                )
+            })
+            .collect();
+
+        let second_scan = adapter.find_sessions_incremental(&known);
+
+        assert!(second_scan.new_or_modified.is_empty());
+        assert!(second_scan.deleted_ids.is_empty());
+    }
+
+    #[test]
+    fn unchanged_files_keep_their_indexed_id() {
+        let temp = tempdir().unwrap();
+        let sessions_dir = temp.path().join("sessions");
+        fs::create_dir_all(&sessions_dir).unwrap();
+        let session_file = sessions_dir.join("copilot-1.jsonl");
+        write_jsonl(
+            &session_file,
+            &[
+                json!({"type": "session.start", "data": {"sessionId": "copilot-1"}}),
+                json!({"type": "user.message", "data": {"content": "Unchanged prompt"}}),
+            ],
+        );
+        let adapter = CopilotCliAdapter { sessions_dir };
+        let mut known = KnownSessions::new();
+        known.insert(
+            ("copilot-cli".to_string(), "copilot-1".to_string()),
+            file_mtime_seconds(&session_file),
+        );
+
+        let (current_files, complete) = adapter.scan_session_files(&known).unwrap();
+
+        assert!(complete);
+        assert_eq!(current_files["copilot-1"].0, session_file);
+        let scan = adapter.find_sessions_incremental(&known);
+        assert!(scan.new_or_modified.is_empty());
+        assert!(scan.deleted_ids.is_empty());
+    }
 }
@@ -9,8 +9,8 @@ use crate::config;
 use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp, truncate_title};
 
 use super::shared::{
-    deleted_ids_for_agent, failed_incremental_scan, session_needs_update, string_at,
-    timestamp_from_ms,
+    deleted_ids_for_agent, failed_incremental_scan, push_message, session_needs_update, str_at,
+    string_at, timestamp_from_ms,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
@@ -253,13 +253,15 @@ impl CopilotVsCodeAdapter {
         }
 
         let mut directory = file.workspace_directory();
-        let mut messages = Vec::new();
+        let mut conversation = String::new();
+        let mut first_message = None;
         let mut turns = 0usize;
 
         for req in requests {
-            let user_text = string_at(req, &["message", "text"]);
+            let user_text = str_at(req, &["message", "text"]);
             if !user_text.is_empty() {
-                messages.push(format!("» {user_text}"));
+                push_message(&mut conversation, "» ", user_text);
+                first_message.get_or_insert(user_text);
                 turns += 1;
             }
 
@@ -281,9 +283,10 @@ impl CopilotVsCodeAdapter {
             let mut has_response = false;
             if let Some(response) = req.get("response").and_then(Value::as_array) {
                 for part in response {
-                    let value = string_at(part, &["value"]);
+                    let value = str_at(part, &["value"]);
                     if !value.is_empty() {
-                        messages.push(format!("  {value}"));
+                        push_message(&mut conversation, "  ", value);
+                        first_message.get_or_insert(value);
                         has_response = true;
                     }
                 }
@@ -293,11 +296,9 @@ impl CopilotVsCodeAdapter {
             }
         }
 
-        if messages.is_empty() {
-            return None;
-        }
+        let first_message = first_message?;
         if title.is_empty() {
-            title = truncate_title(messages[0].trim_start_matches("» ").trim(), 100, true);
+            title = truncate_title(first_message.trim(), 100, true);
         }
 
         let timestamp = timestamp_from_ms(
@@ -313,7 +314,7 @@ impl CopilotVsCodeAdapter {
             title,
             directory,
             timestamp,
-            messages.join("\n\n"),
+            conversation,
             turns,
         );
         session.mtime = file_mtime_seconds(&file.path);
@@ -1,17 +1,19 @@
-use std::collections::{HashMap, HashSet};
+use std::collections::HashSet;
 use std::fs;
 use std::path::{Path, PathBuf};
 
 use chrono::Local;
-use rusqlite::Connection;
+use rayon::prelude::*;
+use rusqlite::types::ValueRef;
+use rusqlite::{Connection, OpenFlags, Row};
 use serde_json::Value;
 
 use crate::config;
 use crate::model::{RawAdapterStats, Session, truncate_title};
 
 use super::shared::{
-    build_resume_command, deleted_ids_for_agent, failed_incremental_scan, session_needs_update,
-    string_at, timestamp_from_ms, timestamp_from_seconds,
+    build_resume_command, deleted_ids_for_agent, failed_incremental_scan, push_message,
+    session_needs_update, str_at, string_at, timestamp_from_ms, timestamp_from_seconds,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
@@ -38,9 +40,11 @@ impl Adapter for CrushAdapter {
     }
 
     fn find_sessions(&self) -> Vec<Session> {
+        // Each project has its own database, so they load in parallel with a
+        // connection per worker.
         let projects = crush_projects(&self.projects_file);
         projects
-            .into_iter()
+            .into_par_iter()
             .flat_map(|(project_path, db_path)| load_crush_db(self.name(), &db_path, &project_path))
             .collect()
     }
@@ -97,10 +101,13 @@ impl CrushAdapter {
         let mut new_or_modified = Vec::new();
 
         for (project_path, db_path) in projects {
-            let Some(load) = load_crush_db_checked(self.name(), &db_path, &project_path) else {
+            let Some(load) =
+                load_crush_db_checked(self.name(), &db_path, &project_path, Some(known))
+            else {
                 return failed_incremental_scan(self.name());
             };
             current_ids.extend(load.incomplete_ids);
+            current_ids.extend(load.unchanged_ids);
             for session in load.sessions {
                 current_ids.insert(session.id.clone());
                 if session_needs_update(known, self.name(), &session.id, session.mtime) {
@@ -119,7 +126,7 @@ impl CrushAdapter {
 }
 
 fn load_crush_db(agent: &'static str, db_path: &Path, project_path: &str) -> Vec<Session> {
-    load_crush_db_checked(agent, db_path, project_path)
+    load_crush_db_checked(agent, db_path, project_path, None)
         .map(|load| load.sessions)
         .unwrap_or_default()
 }
@@ -128,118 +135,210 @@ fn load_crush_db(agent: &'static str, db_path: &Path, project_path: &str) -> Vec
 struct CrushLoad {
     sessions: Vec<Session>,
     incomplete_ids: HashSet<String>,
+    unchanged_ids: HashSet<String>,
 }
 
+/// Loads the sessions in one Crush database. With `known`, a first pass
+/// fingerprints each session's raw rows and only sessions whose marker
+/// changed are decoded and rendered; the rest are listed as unchanged.
 fn load_crush_db_checked(
     agent: &'static str,
     db_path: &Path,
     project_path: &str,
+    known: Option<&KnownSessions>,
 ) -> Option<CrushLoad> {
-    let conn = Connection::open(db_path).ok()?;
+    let conn = Connection::open_with_flags(
+        db_path,
+        OpenFlags::SQLITE_OPEN_READ_ONLY | OpenFlags::SQLITE_OPEN_NO_MUTEX,
+    )
+    .ok()?;
+    // The join is sorted as a whole, so keep the sorter off temp files and
+    // let page reads come straight from a memory map. Both are tuning only,
+    // so a database that rejects them still loads.
+    let _ = conn.pragma_update(None, "temp_store", "MEMORY");
+    let _ = conn.pragma_update(None, "mmap_size", 268_435_456);
+
+    let mut load = CrushLoad::default();
+    let changed_ids = match known {
+        Some(known) => {
+            let mut changed_ids = HashSet::new();
+            let mut current: Option<(String, CrushMarker)> = None;
+            let mut finish = |(id, marker): (String, CrushMarker)| {
+                if session_needs_update(known, agent, &id, marker.value()) {
+                    changed_ids.insert(id);
+                } else {
+                    load.unchanged_ids.insert(id);
+                }
+            };
+            for_each_crush_row(&conn, |row| {
+                if current.as_ref().is_none_or(|(id, _)| id != row.id) {
+                    if let Some(finished) = current.take() {
+                        finish(finished);
+                    }
+                    let marker = CrushMarker::new(agent, project_path, row);
+                    current = Some((row.id.to_string(), marker));
+                }
+                if let Some((_, marker)) = current.as_mut() {
+                    marker.add_row(row);
+                }
+            })?;
+            if let Some(finished) = current {
+                finish(finished);
+            }
+            Some(changed_ids)
+        }
+        None => None,
+    };
+    if changed_ids.as_ref().is_some_and(HashSet::is_empty) {
+        return Some(load);
+    }
+
+    let mut current: Option<CrushSessionRows> = None;
+    for_each_crush_row(&conn, |row| {
+        if changed_ids
+            .as_ref()
+            .is_some_and(|changed_ids| !changed_ids.contains(row.id))
+        {
+            return;
+        }
+        if current.as_ref().is_none_or(|session| session.id != row.id) {
+            if let Some(finished) = current.take() {
+                finished.finish(agent, project_path, &mut load);
+            }
+            current = Some(CrushSessionRows {
+                id: row.id.to_string(),
+                title: row.title.to_string(),
+                updated_at: row.updated_at,
+                created_at: row.created_at,
+                marker: CrushMarker::new(agent, project_path, row),
+                conversation: String::new(),
+                message_count: 0,
+                first_user: String::new(),
+                incomplete: false,
+            });
+        }
+        if let Some(session) = current.as_mut() {
+            session.marker.add_row(row);
+            if !row.role.is_empty() {
+                session.push_message(row.role, row.parts);
+            }
+        }
+    })?;
+    if let Some(finished) = current {
+        finished.finish(agent, project_path, &mut load);
+    }
+    Some(load)
+}
+
+/// One row of the sessions × messages join, borrowed from the statement.
+struct CrushRow<'a> {
+    id: &'a str,
+    title: &'a str,
+    updated_at: i64,
+    created_at: i64,
+    role: &'a str,
+    parts: &'a str,
+    msg_created_at: i64,
+    msg_updated_at: i64,
+}
+
+fn for_each_crush_row(conn: &Connection, mut visit: impl FnMut(&CrushRow<'_>)) -> Option<()> {
+    // Ordering by id after updated_at keeps each session's messages in one
+    // contiguous run, so sessions are handled as their rows stream past.
     let mut stmt = conn
         .prepare(
             r#"
         SELECT
-            s.id, s.title, s.message_count, s.updated_at, s.created_at,
+            s.id, s.title, s.updated_at, s.created_at,
             m.role, m.parts, m.created_at as msg_created_at,
             m.updated_at as msg_updated_at
         FROM sessions s
         LEFT JOIN messages m ON m.session_id = s.id
         WHERE s.message_count > 0
-        ORDER BY s.updated_at DESC, m.created_at ASC
+        ORDER BY s.updated_at DESC, s.id, m.created_at ASC
         "#,
         )
         .ok()?;
+    let mut rows = stmt.query([]).ok()?;
+    while let Some(row) = rows.next().ok()? {
+        visit(&CrushRow {
+            id: row.get_ref(0).ok()?.as_str().ok()?,
+            title: optional_text(row, 1)?,
+            updated_at: row.get::<_, Option<i64>>(2).ok()?.unwrap_or_default(),
+            created_at: row.get::<_, Option<i64>>(3).ok()?.unwrap_or_default(),
+            role: optional_text(row, 4)?,
+            parts: optional_text(row, 5)?,
+            msg_created_at: row.get::<_, Option<i64>>(6).ok()?.unwrap_or_default(),
+            msg_updated_at: row.get::<_, Option<i64>>(7).ok()?.unwrap_or_default(),
+        });
+    }
+    Some(())
+}
 
-    let mut data: HashMap<String, (String, i64, i64, Option<f64>)> = HashMap::new();
-    let mut messages: HashMap<String, Vec<(String, String)>> = HashMap::new();
-    let rows = stmt
-        .query_map([], |row| {
-            Ok((
-                row.get::<_, String>(0)?,
-                row.get::<_, Option<String>>(1)?.unwrap_or_default(),
-                row.get::<_, Option<i64>>(3)?.unwrap_or_default(),
-                row.get::<_, Option<i64>>(4)?.unwrap_or_default(),
-                row.get::<_, Option<String>>(5)?.unwrap_or_default(),
-                row.get::<_, Option<String>>(6)?.unwrap_or_default(),
-                row.get::<_, Option<i64>>(7)?.unwrap_or_default(),
-                row.get::<_, Option<i64>>(8)?.unwrap_or_default(),
-            ))
-        })
-        .ok()?;
+fn optional_text<'a>(row: &'a Row<'_>, index: usize) -> Option<&'a str> {
+    match row.get_ref(index).ok()? {
+        ValueRef::Null => Some(""),
+        value => value.as_str().ok(),
+    }
+}
 
-    for row in rows {
-        let (id, title, updated_at, created_at, role, parts, msg_created_at, msg_updated_at) =
-            row.ok()?;
-        let activity_at =
-            crush_activity_seconds([updated_at, created_at, msg_created_at, msg_updated_at]);
-        data.entry(id.clone())
-            .and_modify(|(_, _, _, known_activity_at)| {
-                if activity_at.is_some_and(|activity_at| {
-                    known_activity_at.is_none_or(|known| activity_at > known)
-                }) {
-                    *known_activity_at = activity_at;
-                }
-            })
-            .or_insert((title, updated_at, created_at, activity_at));
-        if !role.is_empty() {
-            messages.entry(id).or_default().push((role, parts));
+struct CrushSessionRows {
+    id: String,
+    title: String,
+    updated_at: i64,
+    created_at: i64,
+    marker: CrushMarker,
+    conversation: String,
+    message_count: usize,
+    first_user: String,
+    incomplete: bool,
+}
+
+impl CrushSessionRows {
+    fn push_message(&mut self, role: &str, parts: &str) {
+        let Some(text) = crush_parts_text(parts) else {
+            self.incomplete = true;
+            return;
+        };
+        if text.is_empty() {
+            return;
+        }
+        if role == "user" && self.first_user.is_empty() && text.chars().count() > 5 {
+            self.first_user = text.clone();
         }
+        let prefix = if role == "user" { "» " } else { "  " };
+        push_message(&mut self.conversation, prefix, &text);
+        self.message_count += 1;
     }
 
-    let mut sessions = Vec::new();
-    let mut incomplete_ids = HashSet::new();
-    for (id, (title, updated_at, created_at, activity_at)) in data {
-        let mut rendered = Vec::new();
-        let mut first_user = String::new();
-        let timestamp = crush_timestamp(updated_at)
-            .or_else(|| crush_timestamp(created_at))
-            .unwrap_or_else(Local::now);
-        let session_messages = messages.remove(&id).unwrap_or_default();
-        for (role, parts) in session_messages {
-            let Some(text) = crush_parts_text(&parts) else {
-                incomplete_ids.insert(id.clone());
-                continue;
-            };
-            if text.is_empty() {
-                continue;
-            }
-            if role == "user" && first_user.is_empty() && text.chars().count() > 5 {
-                first_user = text.clone();
-            }
-            let prefix = if role == "user" { "» " } else { "  " };
-            rendered.push(format!("{prefix}{text}"));
-        }
-        if incomplete_ids.contains(&id) {
-            continue;
+    fn finish(self, agent: &'static str, project_path: &str, load: &mut CrushLoad) {
+        if self.incomplete {
+            load.incomplete_ids.insert(self.id);
+            return;
         }
-        if rendered.is_empty() || first_user.is_empty() {
-            continue;
+        if self.message_count == 0 || self.first_user.is_empty() {
+            return;
         }
-        let final_title = if title.is_empty() {
-            truncate_title(&first_user, 100, true)
+        let timestamp = crush_timestamp(self.updated_at)
+            .or_else(|| crush_timestamp(self.created_at))
+            .unwrap_or_else(Local::now);
+        let final_title = if self.title.is_empty() {
+            truncate_title(&self.first_user, 100, true)
         } else {
-            title
+            self.title
         };
         let mut session = Session::new(
-            id,
+            self.id,
             agent,
             final_title,
             project_path,
             timestamp,
-            rendered.join("\n\n"),
-            rendered.len(),
-        );
-        session.mtime = crush_refresh_marker(
-            activity_at.unwrap_or_else(|| session.timestamp.timestamp() as f64),
-            &session,
+            self.conversation,
+            self.message_count,
         );
-        sessions.push(session);
+        session.mtime = self.marker.value();
+        load.sessions.push(session);
     }
-    Some(CrushLoad {
-        sessions,
-        incomplete_ids,
-    })
 }
 
 fn crush_activity_seconds(values: impl IntoIterator<Item = i64>) -> Option<f64> {
@@ -249,36 +348,75 @@ fn crush_activity_seconds(values: impl IntoIterator<Item = i64>) -> Option<f64>
         .reduce(f64::max)
 }
 
-fn crush_refresh_marker(activity_at: f64, session: &Session) -> f64 {
+/// Refresh marker for a session: its latest activity second, tagged with a
+/// fingerprint of its raw rows so edits within the same second are still
+/// seen. Built from undecoded rows, so unchanged sessions can be recognised
+/// without rendering them.
+struct CrushMarker {
+    hash: u64,
+    activity_at: Option<f64>,
+}
+
+impl CrushMarker {
     const FNV_OFFSET: u64 = 0xcbf29ce484222325;
     const FNV_PRIME: u64 = 0x100000001b3;
     const FINGERPRINT_BITS: u32 = 20;
-    const FINGERPRINT_MASK: u64 = (1 << FINGERPRINT_BITS) - 1;
+    const FINGERPRINT_MASK: u64 = (1 << Self::FINGERPRINT_BITS) - 1;
     const MARKER_TAG: u64 = 1 << 52;
 
-    let mut hash = FNV_OFFSET;
-    let mut update = |bytes: &[u8]| {
+    fn new(agent: &str, project_path: &str, row: &CrushRow<'_>) -> Self {
+        let mut marker = Self {
+            hash: Self::FNV_OFFSET,
+            activity_at: None,
+        };
+        marker.update(agent.as_bytes());
+        marker.update(project_path.as_bytes());
+        marker.update(row.id.as_bytes());
+        marker.update(row.title.as_bytes());
+        marker.update(&row.updated_at.to_le_bytes());
+        marker.update(&row.created_at.to_le_bytes());
+        marker
+    }
+
+    fn add_row(&mut self, row: &CrushRow<'_>) {
+        let activity_at = crush_activity_seconds([
+            row.updated_at,
+            row.created_at,
+            row.msg_created_at,
+            row.msg_updated_at,
+        ]);
+        if activity_at
+            .is_some_and(|activity_at| self.activity_at.is_none_or(|known| activity_at > known))
+        {
+            self.activity_at = activity_at;
+        }
+        self.update(row.role.as_bytes());
+        self.update(row.parts.as_bytes());
+        self.update(&row.msg_created_at.to_le_bytes());
+        self.update(&row.msg_updated_at.to_le_bytes());
+    }
+
+    fn update(&mut self, bytes: &[u8]) {
         for byte in (bytes.len() as u64)
             .to_le_bytes()
             .into_iter()
             .chain(bytes.iter().copied())
         {
-            hash ^= u64::from(byte);
-            hash = hash.wrapping_mul(FNV_PRIME);
+            self.hash ^= u64::from(byte);
+            self.hash = self.hash.wrapping_mul(Self::FNV_PRIME);
         }
-    };
-    update(session.id.as_bytes());
-    update(session.agent.as_bytes());
-    update(session.title.as_bytes());
-    update(session.directory.as_bytes());
-    update(&session.timestamp.timestamp().to_le_bytes());
-    update(&session.timestamp.timestamp_subsec_nanos().to_le_bytes());
-    update(session.content.as_bytes());
-    update(&(session.message_count as u64).to_le_bytes());
-    update(&[u8::from(session.yolo)]);
-
-    let seconds = activity_at.floor().clamp(0.0, f64::from(u32::MAX)) as u64;
-    (MARKER_TAG | (seconds << FINGERPRINT_BITS) | (hash & FINGERPRINT_MASK)) as f64
+    }
+
+    fn value(&self) -> f64 {
+        // Without any timestamp the session is dated now, as in finish().
+        let activity_at = self
+            .activity_at
+            .unwrap_or_else(|| Local::now().timestamp() as f64);
+        let seconds = activity_at.floor().clamp(0.0, f64::from(u32::MAX)) as u64;
+        (Self::MARKER_TAG
+            | (seconds << Self::FINGERPRINT_BITS)
+            | (self.hash & Self::FINGERPRINT_MASK)) as f64
+    }
 }
 
 fn crush_timestamp_seconds(value: i64) -> Option<f64> {
@@ -306,18 +444,27 @@ fn crush_projects(projects_file: &Path) -> Vec<(String, PathBuf)> {
 }
 
 fn crush_projects_checked(projects_file: &Path) -> Option<Vec<(String, PathBuf)>> {
-    if !projects_file.exists() {
-        return Some(Vec::new());
-    }
-    let data = serde_json::from_slice::<Value>(&fs::read(projects_file).ok()?).ok()?;
+    // Read first and only stat when that fails, so the common case costs a
+    // single open.
+    let bytes = match fs::read(projects_file) {
+        Ok(bytes) => bytes,
+        Err(_) if !projects_file.exists() => return Some(Vec::new()),
+        Err(_) => return None,
+    };
+    let data = serde_json::from_slice::<Value>(&bytes).ok()?;
     let mut projects = Vec::new();
+    let mut seen_dbs = HashSet::new();
     if let Some(items) = data.get("projects").and_then(Value::as_array) {
         for project in items {
             let project_path = string_at(project, &["path"]);
-            let data_dir = string_at(project, &["data_dir"]);
+            let data_dir = str_at(project, &["data_dir"]);
             if !data_dir.is_empty() {
                 let db = PathBuf::from(data_dir).join("crush.db");
-                if db.exists() {
+                // Projects can share a data_dir. Load each database once,
+                // under the first project that lists it, rather than opening
+                // it again and emitting its sessions twice.
+                if !seen_dbs.contains(&db) && db.exists() {
+                    seen_dbs.insert(db.clone());
                     projects.push((project_path, db));
                 }
             }
@@ -329,35 +476,47 @@ fn crush_projects_checked(projects_file: &Path) -> Option<Vec<(String, PathBuf)>
 fn crush_parts_text(parts_json: &str) -> Option<String> {
     let parts = serde_json::from_str::<Value>(parts_json).ok()?;
     let parts = parts.as_array()?;
-    let mut out = Vec::new();
+    let mut out = String::new();
     for part in parts {
-        let part_type = string_at(part, &["type"]);
-        match part_type.as_str() {
+        let data = part.get("data").unwrap_or(&Value::Null);
+        match str_at(part, &["type"]) {
             "text" => {
-                let text = string_at(part, &["data", "text"]);
+                let text = str_at(data, &["text"]);
                 if !text.is_empty() {
-                    out.push(text);
+                    push_part(&mut out, text);
                 }
             }
             "tool_result" => {
-                let content = string_at(part, &["data", "content"]);
-                if !content.is_empty() && content.chars().count() < 500 {
-                    let name = string_at(part, &["data", "name"]);
-                    let name = if name.is_empty() { "tool" } else { &name };
-                    let short: String = content.chars().take(200).collect();
-                    out.push(format!("[{name}]: {short}"));
+                let content = str_at(data, &["content"]);
+                // Long tool output is dropped, so stop counting at the limit
+                // instead of walking all of it.
+                if !content.is_empty() && content.chars().nth(499).is_none() {
+                    let name = str_at(data, &["name"]);
+                    let name = if name.is_empty() { "tool" } else { name };
+                    let short = content
+                        .char_indices()
+                        .nth(200)
+                        .map_or(content, |(end, _)| &content[..end]);
+                    push_part(&mut out, &format!("[{name}]: {short}"));
                 }
             }
             "tool_call" => {
-                let name = string_at(part, &["data", "name"]);
+                let name = str_at(data, &["name"]);
                 if !name.is_empty() {
-                    out.push(format!("[calling {name}]"));
+                    push_part(&mut out, &format!("[calling {name}]"));
                 }
             }
             _ => {}
         }
     }
-    Some(out.join(" "))
+    Some(out)
+}
+
+fn push_part(out: &mut String, part: &str) {
+    if !out.is_empty() {
+        out.push(' ');
+    }
+    out.push_str(part);
 }
 
 #[cfg(test)]
@@ -418,6 +577,33 @@ mod tests {
         assert_eq!(crush_parts_text("[]"), Some(String::new()));
     }
 
+    #[test]
+    fn projects_sharing_a_data_dir_load_its_database_once() {
+        let temp = tempdir().unwrap();
+        let projects_file = temp.path().join("projects.json");
+        let data_dir = temp.path().join("shared-data");
+        fs::create_dir(&data_dir).unwrap();
+        fs::write(data_dir.join("crush.db"), "").unwrap();
+        fs::write(
+            &projects_file,
+            json!({
+                "projects": [
+                    {"path": "/work/app", "data_dir": data_dir},
+                    {"path": "/work/app/sub", "data_dir": data_dir}
+                ]
+            })
+            .to_string(),
+        )
+        .unwrap();
+
+        let projects = crush_projects(&projects_file);
+
+        assert_eq!(
+            projects,
+            vec![("/work/app".to_string(), data_dir.join("crush.db"))]
+        );
+    }
+
     #[test]
     fn incremental_projects_file_errors_do_not_delete_known_sessions() {
         let temp = tempdir().unwrap();
@@ -647,4 +833,113 @@ mod tests {
         assert!(unchanged_scan.new_or_modified.is_empty());
         assert!(unchanged_scan.deleted_ids.is_empty());
     }
+
+    /// One project whose database holds a single session with one user
+    /// message, every timestamp at the same second.
+    fn single_session_db(temp: &Path) -> (CrushAdapter, Connection) {
+        let projects_file = temp.join("projects.json");
+        let data_dir = temp.join("project-data");
+        fs::create_dir(&data_dir).unwrap();
+        let conn = Connection::open(data_dir.join("crush.db")).unwrap();
+        conn.execute_batch(
+            r#"
+            CREATE TABLE sessions (
+                id TEXT PRIMARY KEY,
+                title TEXT,
+                message_count INTEGER,
+                updated_at INTEGER,
+                created_at INTEGER
+            );
+            CREATE TABLE messages (
+                session_id TEXT,
+                role TEXT,
+                parts TEXT,
+                created_at INTEGER,
+                updated_at INTEGER
+            );
+            "#,
+        )
+        .unwrap();
+        conn.execute(
+            "INSERT INTO sessions (id, title, message_count, updated_at, created_at) VALUES (?1, ?2, ?3, ?4, ?5)",
+            (
+                "crush-1",
+                "Crush thread",
+                1_i64,
+                1_720_000_000_i64,
+                1_720_000_000_i64,
+            ),
+        )
+        .unwrap();
+        conn.execute(
+            "INSERT INTO messages (session_id, role, parts, created_at, updated_at) VALUES (?1, ?2, ?3, ?4, ?5)",
+            (
+                "crush-1",
+                "user",
+                json!([{"type": "text", "data": {"text": "Original prompt"}}]).to_string(),
+                1_720_000_000_i64,
+                1_720_000_000_i64,
+            ),
+        )
+        .unwrap();
+        fs::write(
+            &projects_file,
+            json!({
+                "projects": [{
+                    "path": "/work/crush",
+                    "data_dir": data_dir
+                }]
+            })
+            .to_string(),
+        )
+        .unwrap();
+        (CrushAdapter { projects_file }, conn)
+    }
+
+    fn known_from(scan: &IncrementalScan) -> KnownSessions {
+        scan.new_or_modified
+            .iter()
+            .map(|session| ((session.agent.clone(), session.id.clone()), session.mtime))
+            .collect()
+    }
+
+    #[test]
+    fn incremental_skips_unchanged_sessions_on_rescan() {
+        let temp = tempdir().unwrap();
+        let (adapter, _conn) = single_session_db(temp.path());
+
+        let first_scan = adapter.find_sessions_incremental(&KnownSessions::new());
+        assert_eq!(first_scan.new_or_modified.len(), 1);
+
+        let second_scan = adapter.find_sessions_incremental(&known_from(&first_scan));
+
+        assert!(second_scan.new_or_modified.is_empty());
+        assert!(second_scan.deleted_ids.is_empty());
+    }
+
+    #[test]
+    fn incremental_reemits_sessions_whose_rows_change_without_new_timestamps() {
+        let temp = tempdir().unwrap();
+        let (adapter, conn) = single_session_db(temp.path());
+        let first_scan = adapter.find_sessions_incremental(&KnownSessions::new());
+        let known = known_from(&first_scan);
+
+        conn.execute(
+            "UPDATE messages SET parts = ?1 WHERE session_id = ?2",
+            (
+                json!([{"type": "text", "data": {"text": "Edited prompt"}}]).to_string(),
+                "crush-1",
+            ),
+        )
+        .unwrap();
+        let scan = adapter.find_sessions_incremental(&known);
+
+        assert_eq!(scan.new_or_modified.len(), 1);
+        assert!(scan.new_or_modified[0].content.contains("Edited prompt"));
+        assert_ne!(
+            scan.new_or_modified[0].mtime,
+            first_scan.new_or_modified[0].mtime
+        );
+        assert!(scan.deleted_ids.is_empty());
+    }
 }
@@ -3,7 +3,6 @@
 
 use std::collections::HashMap;
 use std::fs;
-use std::io::{BufRead, BufReader};
 use std::path::{Path, PathBuf};
 
 use chrono::{DateTime, Local, TimeZone};
@@ -14,7 +13,8 @@ use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp,
 
 use super::shared::{
     IncrementalParse, build_resume_command, incremental_parse_jsonl, incremental_scan,
-    json_file_has_parse_errors, parse_datetime, percent_decode, raw_stats_for_tree, string_at,
+    is_dir_entry, json_file_has_parse_errors, jsonl_rows, parse_datetime, percent_decode,
+    push_message, raw_stats_for_tree, string_at,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
@@ -68,7 +68,7 @@ impl GrokAdapter {
                 complete = false;
                 continue;
             };
-            if !workspace.path().is_dir() {
+            if !is_dir_entry(&workspace) {
                 continue;
             }
             let Ok(sessions) = fs::read_dir(workspace.path()) else {
@@ -80,10 +80,10 @@ impl GrokAdapter {
                     complete = false;
                     continue;
                 };
-                let session_dir = session.path();
-                if !session_dir.is_dir() {
+                if !is_dir_entry(&session) {
                     continue;
                 }
+                let session_dir = session.path();
                 let Some(id) = session_dir
                     .file_name()
                     .and_then(|name| name.to_str())
@@ -121,7 +121,7 @@ impl GrokAdapter {
             .map(ToString::to_string)
             .unwrap_or_else(|| grok_directory_from_path(updates_path));
 
-        let file = fs::File::open(updates_path).ok()?;
+        let bytes = fs::read(updates_path).ok()?;
         let mut messages: Vec<(bool, String)> = Vec::new();
         let mut user_message_indices = Vec::new();
         let mut pending_user: Option<(Option<usize>, usize)> = None;
@@ -129,8 +129,8 @@ impl GrokAdapter {
         let mut seen_prompt_index = false;
         let mut last_activity = None;
 
-        for line in BufReader::new(file).lines().map_while(Result::ok) {
-            let Ok(record) = serde_json::from_str::<Value>(&line) else {
+        for line in jsonl_rows(&bytes) {
+            let Ok(record) = serde_json::from_slice::<Value>(line) else {
                 continue;
             };
             if let Some(timestamp) = grok_timestamp(record.get("timestamp"))
@@ -244,11 +244,10 @@ impl GrokAdapter {
                     })
             })
             .unwrap_or_else(|| file_timestamp(updates_path));
-        let content = messages
-            .into_iter()
-            .map(|(user, text)| format!("{}{}", if user { "» " } else { "  " }, text))
-            .collect::<Vec<_>>()
-            .join("\n\n");
+        let mut content = String::new();
+        for (user, text) in &messages {
+            push_message(&mut content, if *user { "» " } else { "  " }, text);
+        }
         let mut session = Session::new(
             id,
             self.name(),
@@ -12,7 +12,8 @@ use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp,
 use super::shared::{
     IncrementalParse, build_resume_command, content_texts, failed_incremental_scan,
     incremental_parse_from_option, incremental_parse_jsonl_with_partial_check, incremental_scan,
-    json_file_has_parse_errors, raw_stats_for_tree, string_at, timestamp_from_ms, value_i64_at,
+    json_file_has_parse_errors, jsonl_rows, push_message, raw_stats_for_tree, str_at, string_at,
+    timestamp_from_ms, value_i64_at,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
@@ -225,11 +226,10 @@ impl KimiAdapter {
             .iter()
             .find_map(|entry| entry.user_turn_text.clone())
             .unwrap_or_default();
-        let messages = transcript
-            .entries
-            .into_iter()
-            .flat_map(|entry| entry.rendered)
-            .collect::<Vec<_>>();
+        let mut conversation = String::new();
+        for rendered in transcript.entries.iter().flat_map(|entry| &entry.rendered) {
+            push_message(&mut conversation, "", rendered);
+        }
 
         let title = kimi_state_title(&state)
             .or_else(|| {
@@ -248,7 +248,7 @@ impl KimiAdapter {
             truncate_title(&title, 100, true),
             directory,
             timestamp,
-            messages.join("\n\n"),
+            conversation,
             message_count,
         );
         session.mtime = kimi_session_mtime(state_file, index_mtime);
@@ -448,7 +448,7 @@ fn state_timestamp(state: &Value, key: &str) -> Option<chrono::DateTime<chrono::
 }
 
 fn parse_wire_messages(wire_file: &Path) -> ParsedTranscript {
-    let Ok(file) = fs::File::open(wire_file) else {
+    let Ok(bytes) = fs::read(wire_file) else {
         return ParsedTranscript {
             entries: Vec::new(),
             allow_last_prompt_fallback: true,
@@ -461,14 +461,11 @@ fn parse_wire_messages(wire_file: &Path) -> ParsedTranscript {
     let mut deferred_entries = Vec::new();
     let mut allow_last_prompt_fallback = true;
 
-    for line in BufReader::new(file).lines().map_while(Result::ok) {
-        if line.trim().is_empty() {
-            continue;
-        }
-        let Ok(record) = serde_json::from_str::<Value>(&line) else {
+    for line in jsonl_rows(&bytes) {
+        let Ok(record) = serde_json::from_slice::<Value>(line) else {
             continue;
         };
-        match string_at(&record, &["type"]).as_str() {
+        match str_at(&record, &["type"]) {
             "context.append_message" => {
                 let message = record.get("message").unwrap_or(&Value::Null);
                 if let Some(entry) = kimi_transcript_entry(message) {
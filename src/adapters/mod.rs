@@ -94,8 +94,37 @@ pub fn all_adapters() -> Vec<Box<dyn Adapter>> {
     ]
 }
 
+/// Build only the adapter for `agent`. Output and resume call this per
+/// session, so it must not construct every adapter to pick one.
 pub fn adapter_for(agent: &str) -> Option<Box<dyn Adapter>> {
-    all_adapters()
-        .into_iter()
-        .find(|adapter| adapter.name() == agent)
+    let adapter: Box<dyn Adapter> = match agent {
+        "antigravity" => Box::new(AntigravityAdapter::default()),
+        "claude" => Box::new(ClaudeAdapter::default()),
+        "codex" => Box::new(CodexAdapter::default()),
+        "copilot-cli" => Box::new(CopilotCliAdapter::default()),
+        "copilot-vscode" => Box::new(CopilotVsCodeAdapter::default()),
+        "crush" => Box::new(CrushAdapter::default()),
+        "cursor" => Box::new(CursorAdapter::default()),
+        "grok" => Box::new(GrokAdapter::default()),
+        "kimi" => Box::new(KimiAdapter::default()),
+        "opencode" => Box::new(OpenCodeAdapter::default()),
+        "pi" => Box::new(PiAdapter::default()),
+        "vibe" => Box::new(VibeAdapter::default()),
+        _ => return None,
+    };
+    Some(adapter)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn adapter_for_covers_every_adapter() {
+        for adapter in all_adapters() {
+            let found = adapter_for(adapter.name()).expect("adapter_for misses an adapter");
+            assert_eq!(found.name(), adapter.name());
+        }
+        assert!(adapter_for("unknown").is_none());
+    }
 }
@@ -1,9 +1,14 @@
+use std::cell::RefCell;
 use std::collections::{HashMap, HashSet};
 use std::fs;
+use std::io::Read;
 use std::path::{Path, PathBuf};
 
 use chrono::Local;
+use rayon::prelude::*;
 use rusqlite::{Connection, params_from_iter};
+use serde::Deserialize;
+use serde::de::DeserializeOwned;
 use serde_json::Value;
 use walkdir::WalkDir;
 
@@ -11,8 +16,8 @@ use crate::config;
 use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp};
 
 use super::shared::{
-    datetime_to_seconds, deleted_ids_for_agent, failed_incremental_scan, raw_stats_for_tree,
-    session_needs_update, string_at, timestamp_from_ms, value_i64_at,
+    deleted_ids_for_agent, failed_incremental_scan, push_message, raw_stats_for_tree,
+    seconds_from_ms, session_needs_update, timestamp_from_ms, value_i64_at,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
@@ -41,16 +46,7 @@ impl Adapter for OpenCodeAdapter {
     fn find_sessions(&self) -> Vec<Session> {
         match self.db_path.try_exists() {
             Ok(true) => load_opencode_db(self.name(), &self.db_path),
-            Ok(false) => {
-                let (scanned, _) = scan_opencode_legacy_sessions(&self.legacy_dir);
-                let mut sessions = load_opencode_legacy(self.name(), &self.legacy_dir);
-                for session in &mut sessions {
-                    if let Some((_, mtime)) = scanned.get(&session.id) {
-                        session.mtime = *mtime;
-                    }
-                }
-                sessions
-            }
+            Ok(false) => load_opencode_legacy(self.name(), &self.legacy_dir),
             Err(_) => Vec::new(),
         }
     }
@@ -114,6 +110,30 @@ impl Adapter for OpenCodeAdapter {
     }
 }
 
+/// Renders a session's `(time_created, id, role)` messages with their
+/// `(time_created, text)` parts. The queries return rows in table order, so
+/// each session's messages and each message's parts are put in creation
+/// order here, one short list at a time, instead of SQLite sorting every row
+/// of both tables up front.
+fn render_opencode_messages(
+    messages: &mut [(i64, String, String)],
+    parts_by_message: &mut HashMap<String, Vec<(i64, String)>>,
+) -> String {
+    messages.sort_by_key(|(time_created, _, _)| *time_created);
+    let mut conversation = String::new();
+    for (_, message_id, role) in messages.iter() {
+        let prefix = if role == "user" { "» " } else { "  " };
+        let Some(parts) = parts_by_message.get_mut(message_id) else {
+            continue;
+        };
+        parts.sort_by_key(|(time_created, _)| *time_created);
+        for (_, text) in parts.iter() {
+            push_message(&mut conversation, prefix, text);
+        }
+    }
+    conversation
+}
+
 fn load_opencode_db(agent: &'static str, db_path: &Path) -> Vec<Session> {
     let Ok(conn) = Connection::open(db_path) else {
         return Vec::new();
@@ -143,38 +163,43 @@ fn load_opencode_db(agent: &'static str, db_path: &Path) -> Vec<Session> {
     }
     drop(stmt);
 
-    let mut messages_by_session: HashMap<String, Vec<(String, String)>> = HashMap::new();
+    let mut messages_by_session: HashMap<String, Vec<(i64, String, String)>> = HashMap::new();
     if let Ok(mut stmt) = conn.prepare(
-        "SELECT id, session_id, COALESCE(json_extract(data, '$.role'), '') FROM message ORDER BY time_created ASC",
+        "SELECT id, session_id, COALESCE(json_extract(data, '$.role'), ''), time_created FROM message",
     )
         && let Ok(rows) = stmt.query_map([], |row| {
             Ok((
                 row.get::<_, String>(0)?,
                 row.get::<_, String>(1)?,
                 row.get::<_, String>(2)?,
+                row.get::<_, Option<i64>>(3)?.unwrap_or_default(),
             ))
         }) {
-            for (msg_id, session_id, role) in rows.filter_map(Result::ok) {
+            for (msg_id, session_id, role, time_created) in rows.filter_map(Result::ok) {
                 messages_by_session
                     .entry(session_id)
                     .or_default()
-                    .push((msg_id, role));
+                    .push((time_created, msg_id, role));
             }
         }
 
-    let mut parts_by_message: HashMap<String, Vec<String>> = HashMap::new();
+    let mut parts_by_message: HashMap<String, Vec<(i64, String)>> = HashMap::new();
     if let Ok(mut stmt) = conn.prepare(
-        "SELECT message_id, json_extract(data, '$.text') FROM part WHERE json_extract(data, '$.type') = 'text' ORDER BY time_created ASC",
+        "SELECT message_id, json_extract(data, '$.text'), time_created FROM part WHERE json_extract(data, '$.type') = 'text'",
     )
         && let Ok(rows) = stmt.query_map([], |row| {
             Ok((
                 row.get::<_, String>(0)?,
                 row.get::<_, Option<String>>(1)?.unwrap_or_default(),
+                row.get::<_, Option<i64>>(2)?.unwrap_or_default(),
             ))
         }) {
-            for (message_id, text) in rows.filter_map(Result::ok) {
+            for (message_id, text, time_created) in rows.filter_map(Result::ok) {
                 if !text.is_empty() {
-                    parts_by_message.entry(message_id).or_default().push(text);
+                    parts_by_message
+                        .entry(message_id)
+                        .or_default()
+                        .push((time_created, text));
                 }
             }
         }
@@ -187,21 +212,10 @@ fn load_opencode_db(agent: &'static str, db_path: &Path) -> Vec<Session> {
         let timestamp_ms = time_created
             .max(time_updated)
             .max(activity_mtimes.get(&id).copied().unwrap_or_default());
-        let mtime = timestamp_from_ms(Some(timestamp_ms))
-            .map(datetime_to_seconds)
-            .unwrap_or_else(|| file_mtime_seconds(db_path));
-        let mut rendered = Vec::new();
-        let session_messages = messages_by_session.remove(&id).unwrap_or_default();
-        for (message_id, role) in &session_messages {
-            let prefix = if role == "user" { "» " } else { "  " };
-            for text in parts_by_message
-                .get(message_id)
-                .cloned()
-                .unwrap_or_default()
-            {
-                rendered.push(format!("{prefix}{text}"));
-            }
-        }
+        let mtime =
+            seconds_from_ms(Some(timestamp_ms)).unwrap_or_else(|| file_mtime_seconds(db_path));
+        let mut session_messages = messages_by_session.remove(&id).unwrap_or_default();
+        let conversation = render_opencode_messages(&mut session_messages, &mut parts_by_message);
         let timestamp =
             timestamp_from_ms(Some(time_created.max(time_updated))).unwrap_or_else(Local::now);
         let mut session = Session::new(
@@ -214,7 +228,7 @@ fn load_opencode_db(agent: &'static str, db_path: &Path) -> Vec<Session> {
             },
             directory,
             timestamp,
-            rendered.join("\n\n"),
+            conversation,
             session_messages.len(),
         );
         session.mtime = mtime;
@@ -263,9 +277,8 @@ fn load_opencode_db_incremental(
         let timestamp_ms = time_created
             .max(time_updated)
             .max(activity_mtimes.get(&id).copied().unwrap_or_default());
-        let mtime = timestamp_from_ms(Some(timestamp_ms))
-            .map(datetime_to_seconds)
-            .unwrap_or_else(|| file_mtime_seconds(db_path));
+        let mtime =
+            seconds_from_ms(Some(timestamp_ms)).unwrap_or_else(|| file_mtime_seconds(db_path));
         if session_needs_update(known, agent, &id, mtime) {
             sessions_to_fetch.push((id, title, directory, time_created, time_updated, mtime));
         }
@@ -285,11 +298,11 @@ fn load_opencode_db_incremental(
         .iter()
         .map(|(id, _, _, _, _, _)| id.clone())
         .collect();
-    let mut messages_by_session: HashMap<String, Vec<(String, String)>> = HashMap::new();
+    let mut messages_by_session: HashMap<String, Vec<(i64, String, String)>> = HashMap::new();
     for chunk in fetch_ids.chunks(900) {
         let placeholders = vec!["?"; chunk.len()].join(",");
         let query = format!(
-            "SELECT id, session_id, COALESCE(json_extract(data, '$.role'), '') FROM message WHERE session_id IN ({placeholders}) ORDER BY time_created ASC"
+            "SELECT id, session_id, COALESCE(json_extract(data, '$.role'), ''), time_created FROM message WHERE session_id IN ({placeholders})"
         );
         let mut stmt = match conn.prepare(&query) {
             Ok(stmt) => stmt,
@@ -300,27 +313,28 @@ fn load_opencode_db_incremental(
                 row.get::<_, String>(0)?,
                 row.get::<_, String>(1)?,
                 row.get::<_, String>(2)?,
+                row.get::<_, Option<i64>>(3)?.unwrap_or_default(),
             ))
         }) {
             Ok(rows) => rows,
             Err(_) => return failed_incremental_scan(agent),
         };
         for row in rows {
-            let Ok((msg_id, session_id, role)) = row else {
+            let Ok((msg_id, session_id, role, time_created)) = row else {
                 return failed_incremental_scan(agent);
             };
             messages_by_session
                 .entry(session_id)
                 .or_default()
-                .push((msg_id, role));
+                .push((time_created, msg_id, role));
         }
     }
 
-    let mut parts_by_message: HashMap<String, Vec<String>> = HashMap::new();
+    let mut parts_by_message: HashMap<String, Vec<(i64, String)>> = HashMap::new();
     for chunk in fetch_ids.chunks(900) {
         let placeholders = vec!["?"; chunk.len()].join(",");
         let query = format!(
-            "SELECT message_id, json_extract(data, '$.text') FROM part WHERE session_id IN ({placeholders}) AND json_extract(data, '$.type') = 'text' ORDER BY time_created ASC"
+            "SELECT message_id, json_extract(data, '$.text'), time_created FROM part WHERE session_id IN ({placeholders}) AND json_extract(data, '$.type') = 'text'"
         );
         let mut stmt = match conn.prepare(&query) {
             Ok(stmt) => stmt,
@@ -330,35 +344,29 @@ fn load_opencode_db_incremental(
             Ok((
                 row.get::<_, String>(0)?,
                 row.get::<_, Option<String>>(1)?.unwrap_or_default(),
+                row.get::<_, Option<i64>>(2)?.unwrap_or_default(),
             ))
         }) {
             Ok(rows) => rows,
             Err(_) => return failed_incremental_scan(agent),
         };
         for row in rows {
-            let Ok((message_id, text)) = row else {
+            let Ok((message_id, text, time_created)) = row else {
                 return failed_incremental_scan(agent);
             };
             if !text.is_empty() {
-                parts_by_message.entry(message_id).or_default().push(text);
+                parts_by_message
+                    .entry(message_id)
+                    .or_default()
+                    .push((time_created, text));
             }
         }
     }
 
     let mut new_or_modified = Vec::new();
     for (id, title, directory, time_created, time_updated, mtime) in sessions_to_fetch {
-        let mut rendered = Vec::new();
-        let session_messages = messages_by_session.remove(&id).unwrap_or_default();
-        for (message_id, role) in &session_messages {
-            let prefix = if role == "user" { "» " } else { "  " };
-            for text in parts_by_message
-                .get(message_id)
-                .cloned()
-                .unwrap_or_default()
-            {
-                rendered.push(format!("{prefix}{text}"));
-            }
-        }
+        let mut session_messages = messages_by_session.remove(&id).unwrap_or_default();
+        let conversation = render_opencode_messages(&mut session_messages, &mut parts_by_message);
         let timestamp =
             timestamp_from_ms(Some(time_created.max(time_updated))).unwrap_or_else(Local::now);
         let mut session = Session::new(
@@ -371,7 +379,7 @@ fn load_opencode_db_incremental(
             },
             directory,
             timestamp,
-            rendered.join("\n\n"),
+            conversation,
             session_messages.len(),
         );
         session.mtime = mtime;
@@ -468,8 +476,19 @@ impl Default for LegacyLoad {
     }
 }
 
+/// What a legacy scan learned: each session's file and refresh mtime, and
+/// the message files its activity pass decoded, keyed by path, so the loader
+/// that follows in the same refresh does not decode them a second time.
+#[derive(Default)]
+struct LegacyScan {
+    sessions: HashMap<String, (PathBuf, f64)>,
+    messages: HashMap<PathBuf, (String, String)>,
+    complete: bool,
+}
+
 fn load_opencode_legacy(agent: &'static str, legacy_dir: &Path) -> Vec<Session> {
-    let mut load = load_opencode_legacy_with_health(agent, legacy_dir, None);
+    let scanned = scan_opencode_legacy_sessions(legacy_dir);
+    let mut load = load_opencode_legacy_with_health(agent, legacy_dir, None, &scanned);
     if !load.complete {
         return Vec::new();
     }
@@ -480,10 +499,14 @@ fn load_opencode_legacy(agent: &'static str, legacy_dir: &Path) -> Vec<Session>
 
 /// `only` limits content parsing to the given session ids so an incremental
 /// refresh does not re-read every message and part in the legacy store.
+/// Session mtimes and decoded message files come from `scanned`, whose
+/// activity pass already walked the message and part trees, so neither the
+/// mtimes nor those decodes are repeated here.
 fn load_opencode_legacy_with_health(
     agent: &'static str,
     legacy_dir: &Path,
     only: Option<&HashSet<String>>,
+    scanned: &LegacyScan,
 ) -> LegacyLoad {
     let session_dir = legacy_dir.join("session");
     let message_dir = legacy_dir.join("message");
@@ -498,9 +521,188 @@ fn load_opencode_legacy_with_health(
         }
         Ok(true) => {}
     }
-    let (activity_mtimes, _) = opencode_legacy_activity_mtimes(legacy_dir);
+    // The part walk does not depend on the message files, so it runs
+    // alongside the message walk and reads; its directories are matched to
+    // messages once both are done.
+    let (messages, part_walk) = if only.is_some() {
+        // An incremental load reads a few sessions: listing just their
+        // messages' part directories beats overlapping a walk of every one.
+        let messages = read_legacy_messages(&message_dir, only, scanned);
+        let part_walk = walk_legacy_parts(&part_dir, Some(&messages.message_sessions));
+        (messages, part_walk)
+    } else {
+        rayon::join(
+            || read_legacy_messages(&message_dir, None, scanned),
+            || walk_legacy_parts(&part_dir, None),
+        )
+    };
+    let LegacyMessages {
+        mut messages_by_session,
+        message_sessions,
+        mut incomplete_session_ids,
+        mut complete,
+    } = messages;
+
+    let mut parts_by_message: HashMap<String, Vec<(String, String)>> = HashMap::new();
+    complete &= part_walk.complete;
+    for message_id in &part_walk.failed_message_ids {
+        if let Some(session_id) = message_sessions.get(message_id) {
+            incomplete_session_ids.insert(session_id.clone());
+        }
+    }
+    let part_files: Vec<_> = part_walk
+        .files
+        .into_iter()
+        .filter(|(message_id, _)| message_sessions.contains_key(message_id))
+        .collect();
+    let parts: Vec<_> = part_files
+        .into_par_iter()
+        .map(|(message_id, files)| {
+            let parts: Vec<_> = files
+                .into_par_iter()
+                .map(|(path, file_name)| (file_name, read_legacy_part_text(&path)))
+                .collect();
+            (message_id, parts)
+        })
+        .collect();
+    for (message_id, parts) in parts {
+        let mut texts = Vec::with_capacity(parts.len());
+        for (file_name, text) in parts {
+            match text {
+                Some(LegacyPartText::Text(text)) => texts.push((file_name, text)),
+                Some(LegacyPartText::Skipped) => {}
+                None => {
+                    if let Some(session_id) = message_sessions.get(&message_id) {
+                        incomplete_session_ids.insert(session_id.clone());
+                    }
+                }
+            }
+        }
+        if !texts.is_empty() {
+            parts_by_message
+                .entry(message_id)
+                .or_default()
+                .extend(texts);
+        }
+    }
+
+    let session_files: Vec<_> = legacy_walk(&session_dir)
+        .into_iter()
+        .filter_map(Result::ok)
+        .filter(|entry| {
+            entry
+                .file_name()
+                .to_str()
+                .is_some_and(|name| name.starts_with("ses_") && name.ends_with(".json"))
+        })
+        .map(walkdir::DirEntry::into_path)
+        .collect();
+    let session_data: Vec<_> = session_files
+        .into_par_iter()
+        .filter_map(|path| read_json::<LegacySession>(&path).map(|data| (path, data)))
+        .collect();
+
+    let mut sessions = Vec::new();
+    for (path, mut data) in session_data {
+        let path = path.as_path();
+        let id = into_string(data.id.take());
+        if id.is_empty() {
+            continue;
+        }
+        if only.is_some_and(|ids| !ids.contains(&id)) {
+            continue;
+        }
+        let title = {
+            let value = into_string(data.title.take());
+            if value.is_empty() {
+                "Untitled session".to_string()
+            } else {
+                value
+            }
+        };
+        let directory = into_string(data.directory.take());
+        let timestamp = timestamp_from_ms(data.time_ms()).unwrap_or_else(|| file_timestamp(path));
 
-    let mut messages_by_session: HashMap<String, Vec<(PathBuf, String, String)>> = HashMap::new();
+        let mut session_messages = messages_by_session.remove(&id).unwrap_or_default();
+        session_messages.sort_unstable_by(|a, b| a.0.cmp(&b.0));
+        // Long sessions hold thousands of parts; sizing the buffer up front
+        // copies each one once instead of regrowing the conversation.
+        let capacity = session_messages
+            .iter()
+            .filter_map(|(_, msg_id, _)| parts_by_message.get(msg_id))
+            .flatten()
+            .map(|(_, text)| "\n\n» ".len() + text.len())
+            .sum();
+        let mut conversation = String::with_capacity(capacity);
+        for (_file_name, msg_id, role) in &session_messages {
+            let prefix = if role == "user" { "» " } else { "  " };
+            let Some(parts) = parts_by_message.get_mut(msg_id) else {
+                continue;
+            };
+            parts.sort_unstable_by(|a, b| a.0.cmp(&b.0));
+            for (_file_name, text) in parts.iter() {
+                push_message(&mut conversation, prefix, text);
+            }
+        }
+
+        let mut session = Session::new(
+            id,
+            agent,
+            title,
+            directory,
+            timestamp,
+            conversation,
+            session_messages.len(),
+        );
+        session.mtime = scanned
+            .sessions
+            .get(&session.id)
+            .map_or_else(|| opencode_legacy_mtime(&data, path), |(_, mtime)| *mtime);
+        sessions.push(session);
+    }
+    LegacyLoad {
+        sessions,
+        incomplete_session_ids,
+        complete,
+    }
+}
+
+/// The legacy store keeps its files at most two levels down
+/// (`message/<session id>/msg_*.json`, `part/<message id>/*.json`), so walks
+/// stop there instead of listing anything nested deeper.
+fn legacy_walk(root: &Path) -> WalkDir {
+    WalkDir::new(root).max_depth(2)
+}
+
+/// The id named by a top-level directory of a legacy walk. The walk yields
+/// that directory directly before its files, so the files are attributed to
+/// it as they follow instead of each parsing its parent out of its path.
+fn legacy_dir_id(entry: &walkdir::DirEntry) -> Option<&str> {
+    if !entry.file_type().is_dir() {
+        return None;
+    }
+    entry.file_name().to_str().filter(|id| !id.is_empty())
+}
+
+/// The legacy message files of the sessions being loaded.
+struct LegacyMessages {
+    /// Messages per session as `(file name, message id, role)`. They are
+    /// keyed by file name: the ids embedded in OpenCode's `msg_`/`prt_` names
+    /// sort in creation order, and sorting the name alone is cheaper than
+    /// comparing full paths component by component.
+    messages_by_session: HashMap<String, Vec<(String, String, String)>>,
+    /// Message id to session id.
+    message_sessions: HashMap<String, String>,
+    incomplete_session_ids: HashSet<String>,
+    complete: bool,
+}
+
+fn read_legacy_messages(
+    message_dir: &Path,
+    only: Option<&HashSet<String>>,
+    scanned: &LegacyScan,
+) -> LegacyMessages {
+    let mut messages_by_session: HashMap<String, Vec<(String, String, String)>> = HashMap::new();
     let mut message_sessions = HashMap::new();
     let mut incomplete_session_ids = HashSet::new();
     let mut complete = true;
@@ -512,13 +714,23 @@ fn load_opencode_legacy_with_health(
         }
     };
     if message_dir_exists {
-        for entry in WalkDir::new(&message_dir) {
+        // The walk yields each session directory directly before its files,
+        // so files are grouped under the last directory seen: the id is taken
+        // and allocated once per directory, and never parsed back out of a
+        // file's path. Directories of sessions outside `only` are not listed.
+        let mut message_files: Vec<(String, Vec<(PathBuf, String)>)> = Vec::new();
+        let mut in_session_dir = false;
+        let entries = legacy_walk(message_dir).into_iter().filter_entry(|entry| {
+            entry.depth() != 1
+                || only.is_none_or(|ids| legacy_dir_id(entry).is_some_and(|id| ids.contains(id)))
+        });
+        for entry in entries {
             let entry = match entry {
                 Ok(entry) => entry,
                 Err(error) => {
                     if let Some(session_id) = error
                         .path()
-                        .and_then(|path| legacy_child_id(&message_dir, path))
+                        .and_then(|path| legacy_child_id(message_dir, path))
                     {
                         incomplete_session_ids.insert(session_id);
                     } else {
@@ -527,180 +739,230 @@ fn load_opencode_legacy_with_health(
                     continue;
                 }
             };
-            let path = entry.path();
-            if !path
-                .file_name()
-                .and_then(|name| name.to_str())
-                .is_some_and(|name| name.starts_with("msg_") && name.ends_with(".json"))
-            {
+            if entry.depth() == 1 {
+                in_session_dir = false;
+                let Some(session_id) = legacy_dir_id(&entry) else {
+                    continue;
+                };
+                message_files.push((session_id.to_string(), Vec::new()));
+                in_session_dir = true;
                 continue;
             }
-            let Some(session_id) = path
-                .parent()
-                .and_then(|p| p.file_name())
-                .and_then(|n| n.to_str())
-                .map(ToString::to_string)
-            else {
-                continue;
-            };
-            if only.is_some_and(|ids| !ids.contains(&session_id)) {
+            if !in_session_dir {
                 continue;
             }
-            let Ok(data_bytes) = fs::read(path) else {
-                incomplete_session_ids.insert(session_id);
-                continue;
-            };
-            let Ok(data) = serde_json::from_slice::<Value>(&data_bytes) else {
-                incomplete_session_ids.insert(session_id);
+            let Some(file_name) = entry
+                .file_name()
+                .to_str()
+                .filter(|name| name.starts_with("msg_") && name.ends_with(".json"))
+            else {
                 continue;
             };
-            let msg_id = string_at(&data, &["id"]);
-            if msg_id.is_empty() {
-                incomplete_session_ids.insert(session_id);
-                continue;
+            let file_name = file_name.to_string();
+            if let Some((_, files)) = message_files.last_mut() {
+                files.push((entry.into_path(), file_name));
+            }
+        }
+
+        // Reading and decoding the files is independent per file, so it runs
+        // in parallel; the results are folded in walk order.
+        let messages: Vec<_> = message_files
+            .into_par_iter()
+            .map(|(session_id, files)| {
+                let messages: Vec<_> = files
+                    .into_par_iter()
+                    .map(|(path, file_name)| {
+                        let message = match scanned.messages.get(&path) {
+                            Some(message) => Some(message.clone()),
+                            None => read_json::<LegacyMessage>(&path)
+                                .map(|data| (into_string(data.id), into_string(data.role))),
+                        };
+                        (file_name, message)
+                    })
+                    .collect();
+                (session_id, messages)
+            })
+            .collect();
+        for (session_id, messages) in messages {
+            let mut session_messages = Vec::with_capacity(messages.len());
+            for (file_name, message) in messages {
+                let Some((msg_id, role)) = message.filter(|(msg_id, _)| !msg_id.is_empty()) else {
+                    incomplete_session_ids.insert(session_id.clone());
+                    continue;
+                };
+                message_sessions.insert(msg_id.clone(), session_id.clone());
+                session_messages.push((file_name, msg_id, role));
             }
-            let role = string_at(&data, &["role"]);
-            message_sessions.insert(msg_id.clone(), session_id.clone());
-            messages_by_session.entry(session_id).or_default().push((
-                path.to_path_buf(),
-                msg_id,
-                role,
-            ));
+            messages_by_session
+                .entry(session_id)
+                .or_default()
+                .extend(session_messages);
         }
     }
+    LegacyMessages {
+        messages_by_session,
+        message_sessions,
+        incomplete_session_ids,
+        complete,
+    }
+}
 
-    let mut parts_by_message: HashMap<String, Vec<String>> = HashMap::new();
-    let part_dir_exists = match part_dir.try_exists() {
-        Ok(exists) => exists,
+/// The legacy part tree, grouped per message directory. With `wanted`, only
+/// the directories of those message ids are listed.
+struct LegacyPartWalk {
+    files: Vec<(String, Vec<(PathBuf, String)>)>,
+    /// Message directories that could not be listed.
+    failed_message_ids: Vec<String>,
+    complete: bool,
+}
+
+fn walk_legacy_parts(part_dir: &Path, wanted: Option<&HashMap<String, String>>) -> LegacyPartWalk {
+    let mut walk = LegacyPartWalk {
+        files: Vec::new(),
+        failed_message_ids: Vec::new(),
+        complete: true,
+    };
+    match part_dir.try_exists() {
+        Ok(true) => {}
+        Ok(false) => return walk,
         Err(_) => {
-            complete = false;
-            false
+            walk.complete = false;
+            return walk;
         }
-    };
-    if part_dir_exists {
-        for entry in WalkDir::new(&part_dir) {
-            let entry = match entry {
-                Ok(entry) => entry,
-                Err(error) => {
-                    let Some(message_id) = error
-                        .path()
-                        .and_then(|path| legacy_child_id(&part_dir, path))
-                    else {
-                        complete = false;
-                        continue;
-                    };
-                    if let Some(session_id) = message_sessions.get(&message_id) {
-                        incomplete_session_ids.insert(session_id.clone());
-                    }
-                    continue;
+    }
+    let mut in_message_dir = false;
+    let entries = legacy_walk(part_dir).into_iter().filter_entry(|entry| {
+        entry.depth() != 1
+            || wanted.is_none_or(|ids| legacy_dir_id(entry).is_some_and(|id| ids.contains_key(id)))
+    });
+    for entry in entries {
+        let entry = match entry {
+            Ok(entry) => entry,
+            Err(error) => {
+                match error
+                    .path()
+                    .and_then(|path| legacy_child_id(part_dir, path))
+                {
+                    Some(message_id) => walk.failed_message_ids.push(message_id),
+                    None => walk.complete = false,
                 }
-            };
-            let path = entry.path();
-            if path.extension().and_then(|e| e.to_str()) != Some("json") {
-                continue;
-            }
-            let Some(message_id) = path
-                .parent()
-                .and_then(|p| p.file_name())
-                .and_then(|n| n.to_str())
-            else {
-                continue;
-            };
-            let Some(session_id) = message_sessions.get(message_id) else {
-                continue;
-            };
-            let Ok(data_bytes) = fs::read(path) else {
-                incomplete_session_ids.insert(session_id.clone());
-                continue;
-            };
-            let Ok(data) = serde_json::from_slice::<Value>(&data_bytes) else {
-                incomplete_session_ids.insert(session_id.clone());
-                continue;
-            };
-            let Some(part_type) = data.get("type").and_then(Value::as_str) else {
-                incomplete_session_ids.insert(session_id.clone());
-                continue;
-            };
-            if part_type != "text" {
                 continue;
             }
-            let Some(text) = data.get("text").and_then(Value::as_str) else {
-                incomplete_session_ids.insert(session_id.clone());
+        };
+        if entry.depth() == 1 {
+            in_message_dir = false;
+            let Some(message_id) = legacy_dir_id(&entry) else {
                 continue;
             };
-            if !text.is_empty() {
-                parts_by_message
-                    .entry(message_id.to_string())
-                    .or_default()
-                    .push(text.to_string());
-            }
-        }
-    }
-
-    let mut sessions = Vec::new();
-    for entry in WalkDir::new(&session_dir)
-        .into_iter()
-        .filter_map(Result::ok)
-    {
-        let path = entry.path();
-        if !path
-            .file_name()
-            .and_then(|name| name.to_str())
-            .is_some_and(|name| name.starts_with("ses_") && name.ends_with(".json"))
-        {
+            walk.files.push((message_id.to_string(), Vec::new()));
+            in_message_dir = true;
             continue;
         }
-        let Ok(data) = serde_json::from_slice::<Value>(&fs::read(path).unwrap_or_default()) else {
-            continue;
-        };
-        let id = string_at(&data, &["id"]);
-        if id.is_empty() {
+        if !in_message_dir {
             continue;
         }
-        if only.is_some_and(|ids| !ids.contains(&id)) {
+        let Some(file_name) = entry
+            .file_name()
+            .to_str()
+            .filter(|name| name.ends_with(".json"))
+        else {
             continue;
-        }
-        let title = {
-            let value = string_at(&data, &["title"]);
-            if value.is_empty() {
-                "Untitled session".to_string()
-            } else {
-                value
-            }
         };
-        let directory = string_at(&data, &["directory"]);
-        let time_ms = value_i64_at(&data, &["time", "updated"])
-            .or_else(|| value_i64_at(&data, &["time", "created"]));
-        let timestamp = timestamp_from_ms(time_ms).unwrap_or_else(|| file_timestamp(path));
-
-        let mut rendered = Vec::new();
-        let mut session_messages = messages_by_session.remove(&id).unwrap_or_default();
-        session_messages.sort_by(|a, b| a.0.cmp(&b.0));
-        for (_path, msg_id, role) in &session_messages {
-            let prefix = if role == "user" { "» " } else { "  " };
-            for text in parts_by_message.get(msg_id).cloned().unwrap_or_default() {
-                rendered.push(format!("{prefix}{text}"));
-            }
+        let file_name = file_name.to_string();
+        if let Some((_, files)) = walk.files.last_mut() {
+            files.push((entry.into_path(), file_name));
         }
+    }
+    walk
+}
 
-        let mut session = Session::new(
-            id,
-            agent,
-            title,
-            directory,
-            timestamp,
-            rendered.join("\n\n"),
-            session_messages.len(),
-        );
-        session.mtime = opencode_legacy_mtime(&data, path)
-            .max(activity_mtimes.get(&session.id).copied().unwrap_or(0.0));
-        sessions.push(session);
+thread_local! {
+    /// Per-thread read buffer. The legacy store holds thousands of small
+    /// JSON files, so each worker reuses one allocation across them.
+    static READ_BUFFER: RefCell<Vec<u8>> = const { RefCell::new(Vec::new()) };
+}
+
+/// Decodes a JSON file. UTF-8 is checked up front because fields a typed
+/// target skips are not otherwise validated, and a file that would not parse
+/// as a `Value` must still count as malformed.
+fn read_json<T: DeserializeOwned>(path: &Path) -> Option<T> {
+    let mut file = fs::File::open(path).ok()?;
+    READ_BUFFER.with_borrow_mut(|buffer| {
+        buffer.clear();
+        file.read_to_end(buffer).ok()?;
+        serde_json::from_str(std::str::from_utf8(buffer).ok()?).ok()
+    })
+}
+
+/// The fields of a legacy session file the loader and the scan read. Like
+/// the message and part shapes below, fields are kept as `Value` so a
+/// mistyped field reads as empty, as it did through `string_at`, instead of
+/// failing the whole file; everything else in the file is skipped unbuilt.
+#[derive(Deserialize)]
+struct LegacySession {
+    #[serde(default)]
+    id: Value,
+    #[serde(default)]
+    title: Value,
+    #[serde(default)]
+    directory: Value,
+    #[serde(default)]
+    time: Value,
+}
+
+impl LegacySession {
+    fn time_ms(&self) -> Option<i64> {
+        value_i64_at(&self.time, &["updated"]).or_else(|| value_i64_at(&self.time, &["created"]))
     }
-    LegacyLoad {
-        sessions,
-        incomplete_session_ids,
-        complete,
+}
+
+/// The fields of a legacy message file the loader reads.
+#[derive(Deserialize)]
+struct LegacyMessage {
+    #[serde(default)]
+    id: Value,
+    #[serde(default)]
+    role: Value,
+}
+
+fn into_string(value: Value) -> String {
+    match value {
+        Value::String(value) => value,
+        _ => String::new(),
+    }
+}
+
+/// The fields of a legacy part file the loader reads. Tool and reasoning
+/// parts, which outnumber text parts, carry large payloads that are skipped
+/// without building values for them.
+#[derive(Deserialize)]
+struct LegacyPart {
+    #[serde(rename = "type", default)]
+    kind: Value,
+    #[serde(default)]
+    text: Value,
+}
+
+enum LegacyPartText {
+    Text(String),
+    Skipped,
+}
+
+/// Reads a part file's text. Parts that are not text, or whose text is
+/// empty, are skipped; unreadable or malformed parts return `None`.
+fn read_legacy_part_text(path: &Path) -> Option<LegacyPartText> {
+    let part = read_json::<LegacyPart>(path)?;
+    if part.kind.as_str()? != "text" {
+        return Some(LegacyPartText::Skipped);
     }
+    let Value::String(text) = part.text else {
+        return None;
+    };
+    Some(if text.is_empty() {
+        LegacyPartText::Skipped
+    } else {
+        LegacyPartText::Text(text)
+    })
 }
 
 fn legacy_child_id(root: &Path, path: &Path) -> Option<String> {
@@ -719,14 +981,15 @@ fn load_opencode_legacy_incremental(
     legacy_dir: &Path,
     known: &KnownSessions,
 ) -> IncrementalScan {
-    let (current_files, complete) = scan_opencode_legacy_sessions(legacy_dir);
-    let current_ids: HashSet<_> = current_files.keys().cloned().collect();
-    let deleted_ids = if complete {
+    let scanned = scan_opencode_legacy_sessions(legacy_dir);
+    let current_ids: HashSet<_> = scanned.sessions.keys().cloned().collect();
+    let deleted_ids = if scanned.complete {
         deleted_ids_for_agent(known, agent, &current_ids)
     } else {
         Vec::new()
     };
-    let changed_ids: HashSet<_> = current_files
+    let changed_ids: HashSet<_> = scanned
+        .sessions
         .iter()
         .filter(|&(id, (_, mtime))| session_needs_update(known, agent, id, *mtime))
         .map(|(id, (_, _mtime))| id.clone())
@@ -744,7 +1007,7 @@ fn load_opencode_legacy_incremental(
         sessions,
         incomplete_session_ids,
         complete: content_complete,
-    } = load_opencode_legacy_with_health(agent, legacy_dir, Some(&changed_ids));
+    } = load_opencode_legacy_with_health(agent, legacy_dir, Some(&changed_ids), &scanned);
     if !content_complete {
         return IncrementalScan {
             agent,
@@ -753,16 +1016,13 @@ fn load_opencode_legacy_incremental(
         };
     }
     let mut new_or_modified = Vec::new();
-    for mut session in sessions {
+    for session in sessions {
         if !changed_ids.contains(&session.id) {
             continue;
         }
         if incomplete_session_ids.contains(&session.id) {
             continue;
         }
-        if let Some((_, mtime)) = current_files.get(&session.id) {
-            session.mtime = *mtime;
-        }
         new_or_modified.push(session);
     }
 
@@ -773,21 +1033,27 @@ fn load_opencode_legacy_incremental(
     }
 }
 
-fn scan_opencode_legacy_sessions(legacy_dir: &Path) -> (HashMap<String, (PathBuf, f64)>, bool) {
-    let mut current_files = HashMap::new();
-    let mut complete = true;
+fn scan_opencode_legacy_sessions(legacy_dir: &Path) -> LegacyScan {
+    let mut scan = LegacyScan {
+        complete: true,
+        ..LegacyScan::default()
+    };
     let session_dir = legacy_dir.join("session");
     match session_dir.try_exists() {
-        Ok(false) => return (current_files, complete),
-        Err(_) => return (current_files, false),
+        Ok(false) => return scan,
+        Err(_) => {
+            scan.complete = false;
+            return scan;
+        }
         Ok(true) => {}
     }
-    let (activity_mtimes, activity_complete) = opencode_legacy_activity_mtimes(legacy_dir);
-    complete &= activity_complete;
+    let (activity_mtimes, activity_complete) =
+        opencode_legacy_activity_mtimes(legacy_dir, &mut scan.messages);
+    scan.complete &= activity_complete;
 
-    for entry in WalkDir::new(&session_dir) {
+    for entry in legacy_walk(&session_dir) {
         let Ok(entry) = entry else {
-            complete = false;
+            scan.complete = false;
             continue;
         };
         let path = entry.path();
@@ -798,28 +1064,29 @@ fn scan_opencode_legacy_sessions(legacy_dir: &Path) -> (HashMap<String, (PathBuf
         {
             continue;
         }
-        let Ok(data_bytes) = fs::read(path) else {
-            complete = false;
-            continue;
-        };
-        let Ok(data) = serde_json::from_slice::<Value>(&data_bytes) else {
-            complete = false;
+        let Some(mut data) = read_json::<LegacySession>(path) else {
+            scan.complete = false;
             continue;
         };
-        let id = string_at(&data, &["id"]);
+        let id = into_string(data.id.take());
         if id.is_empty() {
-            complete = false;
+            scan.complete = false;
             continue;
         }
         let mtime = opencode_legacy_mtime(&data, path)
             .max(activity_mtimes.get(&id).copied().unwrap_or(0.0));
-        current_files.insert(id, (path.to_path_buf(), mtime));
+        scan.sessions.insert(id, (path.to_path_buf(), mtime));
     }
 
-    (current_files, complete)
+    scan
 }
 
-fn opencode_legacy_activity_mtimes(legacy_dir: &Path) -> (HashMap<String, f64>, bool) {
+/// Returns each session's latest message or part file mtime. Message files
+/// that decode cleanly are recorded in `messages` for the loader.
+fn opencode_legacy_activity_mtimes(
+    legacy_dir: &Path,
+    messages: &mut HashMap<PathBuf, (String, String)>,
+) -> (HashMap<String, f64>, bool) {
     let message_dir = legacy_dir.join("message");
     let part_dir = legacy_dir.join("part");
     let mut session_mtimes: HashMap<String, f64> = HashMap::new();
@@ -834,44 +1101,36 @@ fn opencode_legacy_activity_mtimes(legacy_dir: &Path) -> (HashMap<String, f64>,
         }
     };
     if message_dir_exists {
-        for entry in WalkDir::new(&message_dir) {
+        let mut current_session: Option<String> = None;
+        for entry in legacy_walk(&message_dir) {
             let Ok(entry) = entry else {
                 complete = false;
                 continue;
             };
-            let path = entry.path();
-            if !path
-                .file_name()
-                .and_then(|name| name.to_str())
-                .is_some_and(|name| name.starts_with("msg_") && name.ends_with(".json"))
-            {
+            if entry.depth() == 1 {
+                current_session = legacy_dir_id(&entry).map(ToString::to_string);
                 continue;
             }
-            let Some(session_id) = path
-                .parent()
-                .and_then(|p| p.file_name())
-                .and_then(|n| n.to_str())
-                .filter(|id| !id.is_empty())
-                .map(ToString::to_string)
-            else {
+            let Some(session_id) = current_session.as_deref() else {
                 continue;
             };
-            let mtime = file_mtime_seconds(path);
-            session_mtimes
-                .entry(session_id.clone())
-                .and_modify(|known| *known = known.max(mtime))
-                .or_insert(mtime);
-            let Ok(data_bytes) = fs::read(path) else {
-                complete = false;
+            if !entry
+                .file_name()
+                .to_str()
+                .is_some_and(|name| name.starts_with("msg_") && name.ends_with(".json"))
+            {
                 continue;
-            };
-            let Ok(data) = serde_json::from_slice::<Value>(&data_bytes) else {
+            }
+            let path = entry.path();
+            record_activity(&mut session_mtimes, session_id, file_mtime_seconds(path));
+            let Some(data) = read_json::<LegacyMessage>(path) else {
                 complete = false;
                 continue;
             };
-            let msg_id = string_at(&data, &["id"]);
+            let msg_id = into_string(data.id);
             if !msg_id.is_empty() {
-                message_sessions.insert(msg_id, session_id);
+                messages.insert(path.to_path_buf(), (msg_id.clone(), into_string(data.role)));
+                message_sessions.insert(msg_id, session_id.to_string());
             } else {
                 complete = false;
             }
@@ -886,41 +1145,42 @@ fn opencode_legacy_activity_mtimes(legacy_dir: &Path) -> (HashMap<String, f64>,
         }
     };
     if part_dir_exists {
-        for entry in WalkDir::new(&part_dir) {
+        let mut current_session: Option<&String> = None;
+        for entry in legacy_walk(&part_dir) {
             let Ok(entry) = entry else {
                 complete = false;
                 continue;
             };
-            let path = entry.path();
-            if path.extension().and_then(|e| e.to_str()) != Some("json") {
+            if entry.depth() == 1 {
+                current_session =
+                    legacy_dir_id(&entry).and_then(|message_id| message_sessions.get(message_id));
                 continue;
             }
-            let Some(message_id) = path
-                .parent()
-                .and_then(|p| p.file_name())
-                .and_then(|n| n.to_str())
-            else {
+            let Some(session_id) = current_session else {
                 continue;
             };
-            let Some(session_id) = message_sessions.get(message_id) else {
+            let path = entry.path();
+            if path.extension().and_then(|e| e.to_str()) != Some("json") {
                 continue;
-            };
-            let mtime = file_mtime_seconds(path);
-            session_mtimes
-                .entry(session_id.clone())
-                .and_modify(|known| *known = known.max(mtime))
-                .or_insert(mtime);
+            }
+            record_activity(&mut session_mtimes, session_id, file_mtime_seconds(path));
         }
     }
 
     (session_mtimes, complete)
 }
 
-fn opencode_legacy_mtime(data: &Value, path: &Path) -> f64 {
-    let time_ms = value_i64_at(data, &["time", "updated"])
-        .or_else(|| value_i64_at(data, &["time", "created"]));
-    timestamp_from_ms(time_ms)
-        .map(datetime_to_seconds)
+fn record_activity(session_mtimes: &mut HashMap<String, f64>, session_id: &str, mtime: f64) {
+    match session_mtimes.get_mut(session_id) {
+        Some(known) => *known = known.max(mtime),
+        None => {
+            session_mtimes.insert(session_id.to_string(), mtime);
+        }
+    }
+}
+
+fn opencode_legacy_mtime(data: &LegacySession, path: &Path) -> f64 {
+    seconds_from_ms(data.time_ms())
         .unwrap_or(0.0)
         .max(file_mtime_seconds(path))
 }
@@ -936,6 +1196,7 @@ mod tests {
     use tempfile::tempdir;
 
     use crate::adapters::Adapter;
+    use crate::adapters::shared::datetime_to_seconds;
 
     use super::*;
 
@@ -989,6 +1250,57 @@ mod tests {
         );
     }
 
+    #[test]
+    fn legacy_messages_and_parts_render_in_file_name_order() {
+        let temp = tempdir().unwrap();
+        let legacy_dir = temp.path().join("legacy");
+        let session_dir = legacy_dir.join("session");
+        let message_dir = legacy_dir.join("message/opencode-1");
+        fs::create_dir_all(&session_dir).unwrap();
+        fs::create_dir_all(&message_dir).unwrap();
+        fs::write(
+            session_dir.join("ses_opencode-1.json"),
+            json!({"id": "opencode-1", "title": "Ordered"}).to_string(),
+        )
+        .unwrap();
+        for (name, id, role, parts) in [
+            (
+                "msg_2.json",
+                "msg-2",
+                "assistant",
+                [("prt_2.json", "fourth"), ("prt_1.json", "third")],
+            ),
+            (
+                "msg_1.json",
+                "msg-1",
+                "user",
+                [("prt_2.json", "second"), ("prt_1.json", "first")],
+            ),
+        ] {
+            fs::write(
+                message_dir.join(name),
+                json!({"id": id, "role": role}).to_string(),
+            )
+            .unwrap();
+            let part_dir = legacy_dir.join("part").join(id);
+            fs::create_dir_all(&part_dir).unwrap();
+            for (part_name, text) in parts {
+                fs::write(
+                    part_dir.join(part_name),
+                    json!({"type": "text", "text": text}).to_string(),
+                )
+                .unwrap();
+            }
+        }
+
+        let sessions = load_opencode_legacy("opencode", &legacy_dir);
+        assert_eq!(sessions.len(), 1);
+        assert_eq!(
+            sessions[0].content,
+            "» first\n\n» second\n\n  third\n\n  fourth"
+        );
+    }
+
     #[test]
     fn legacy_incremental_parses_only_changed_sessions_and_keeps_the_rest() {
         let temp = tempdir().unwrap();
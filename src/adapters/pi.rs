@@ -1,6 +1,6 @@
 use std::collections::HashMap;
 use std::fs;
-use std::io::{BufRead, BufReader};
+use std::io::BufReader;
 use std::path::{Path, PathBuf};
 
 use chrono::{DateTime, Local, TimeZone};
@@ -11,8 +11,8 @@ use crate::config;
 use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp, truncate_title};
 
 use super::shared::{
-    IncrementalParse, incremental_parse_jsonl, incremental_scan, parse_datetime,
-    raw_stats_for_tree, string_at,
+    IncrementalParse, incremental_parse_jsonl, incremental_scan, jsonl_rows, parse_datetime,
+    push_message, raw_stats_for_tree, str_at, string_at, visit_jsonl_rows,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
@@ -78,42 +78,37 @@ impl PiAdapter {
     }
 
     fn session_id_from_file(&self, path: &Path) -> String {
+        let mut session_id = None;
         if let Ok(file) = fs::File::open(path) {
-            for line in BufReader::new(file).lines().map_while(Result::ok) {
-                if line.trim().is_empty() {
-                    continue;
-                }
-                let Ok(data) = serde_json::from_str::<Value>(&line) else {
-                    continue;
+            // The session header is the first row, so stop at the first row
+            // that parses.
+            let _ = visit_jsonl_rows(BufReader::new(file), |row| {
+                let Ok(data) = serde_json::from_slice::<Value>(row) else {
+                    return true;
                 };
-                if string_at(&data, &["type"]) == "session" {
-                    let id = string_at(&data, &["id"]);
-                    if !id.is_empty() {
-                        return id;
-                    }
+                if str_at(&data, &["type"]) == "session" {
+                    let id = str_at(&data, &["id"]);
+                    session_id = (!id.is_empty()).then(|| id.to_string());
                 }
-                break;
-            }
+                false
+            });
         }
-        pi_session_id_from_path(path)
+        session_id.unwrap_or_else(|| pi_session_id_from_path(path))
     }
 
     fn parse_session(&self, path: &Path) -> Option<Session> {
-        let file = fs::File::open(path).ok()?;
+        let bytes = fs::read(path).ok()?;
         let mut session_id = String::new();
         let mut directory = String::new();
         let mut session_name: Option<String> = None;
         let mut first_user_message = String::new();
-        let mut messages = Vec::new();
+        let mut conversation = String::new();
         let mut message_count = 0usize;
         let mut header_timestamp: Option<DateTime<Local>> = None;
         let mut last_activity: Option<DateTime<Local>> = None;
 
-        for line in BufReader::new(file).lines().map_while(Result::ok) {
-            if line.trim().is_empty() {
-                continue;
-            }
-            let Ok(data) = serde_json::from_str::<Value>(&line) else {
+        for line in jsonl_rows(&bytes) {
+            let Ok(data) = serde_json::from_slice::<Value>(line) else {
                 continue;
             };
             match string_at(&data, &["type"]).as_str() {
@@ -158,18 +153,18 @@ impl PiAdapter {
                         if is_user && first_user_message.is_empty() {
                             first_user_message = text.clone();
                         }
-                        messages.push(format!("{role_prefix}{text}"));
+                        push_message(&mut conversation, role_prefix, &text);
                     }
                 }
                 "custom_message" if data.get("display").and_then(Value::as_bool) == Some(true) => {
                     for text in pi_content_texts(data.get("content").unwrap_or(&Value::Null)) {
-                        messages.push(format!("  {text}"));
+                        push_message(&mut conversation, "  ", &text);
                     }
                 }
                 "compaction" | "branch_summary" => {
                     let summary = string_at(&data, &["summary"]);
                     if !summary.trim().is_empty() {
-                        messages.push(format!("  {summary}"));
+                        push_message(&mut conversation, "  ", &summary);
                     }
                 }
                 _ => {}
@@ -179,7 +174,7 @@ impl PiAdapter {
         if session_id.is_empty() {
             session_id = pi_session_id_from_path(path);
         }
-        if first_user_message.is_empty() && messages.is_empty() {
+        if first_user_message.is_empty() && conversation.is_empty() {
             return None;
         }
 
@@ -198,7 +193,7 @@ impl PiAdapter {
             last_activity
                 .or(header_timestamp)
                 .unwrap_or_else(|| file_timestamp(path)),
-            messages.join("\n\n"),
+            conversation,
             message_count,
         );
         session.mtime = file_mtime_seconds(path);
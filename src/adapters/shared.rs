@@ -1,9 +1,10 @@
 use std::collections::{HashMap, HashSet};
 use std::fs;
-use std::io::{BufRead, BufReader};
+use std::io::{self, BufRead};
 use std::path::{Path, PathBuf};
 
 use chrono::{DateTime, Local, NaiveDateTime, TimeZone};
+use serde::de::IgnoredAny;
 use serde_json::Value;
 use walkdir::WalkDir;
 
@@ -84,6 +85,16 @@ fn sqlite_sidecar_path(path: &Path, suffix: &str) -> PathBuf {
     ))
 }
 
+/// Whether a directory entry is a directory, taking its type from the listing
+/// so only symlinked entries need a `stat`.
+pub(super) fn is_dir_entry(entry: &fs::DirEntry) -> bool {
+    match entry.file_type() {
+        Ok(file_type) if file_type.is_symlink() => entry.path().is_dir(),
+        Ok(file_type) => file_type.is_dir(),
+        Err(_) => false,
+    }
+}
+
 /// Run the shared incremental-scan skeleton over keyed session files,
 /// streaming each parsed session to `on_session` when a callback is given.
 /// `scanned` is None when the file scan itself failed. An incomplete scan
@@ -154,6 +165,17 @@ pub(super) fn build_resume_command(
     command
 }
 
+/// Append one message to a session's conversation text, separating messages
+/// with a blank line. Writing into one buffer avoids a formatted `String` per
+/// message and the copy made by joining them at the end.
+pub(super) fn push_message(conversation: &mut String, prefix: &str, text: &str) {
+    if !conversation.is_empty() {
+        conversation.push_str("\n\n");
+    }
+    conversation.push_str(prefix);
+    conversation.push_str(text);
+}
+
 pub(super) fn percent_decode(value: &str) -> String {
     let bytes = value.as_bytes();
     let mut output = Vec::with_capacity(bytes.len());
@@ -203,27 +225,47 @@ where
 }
 
 pub(super) fn json_file_has_parse_errors(path: &Path) -> bool {
-    let Ok(data) = fs::read(path) else {
-        return true;
-    };
-    serde_json::from_slice::<Value>(&data).is_err()
+    fs::read(path).map_or(true, |data| !is_json_row(&data))
+}
+
+/// Feed the non-blank rows of a JSONL reader to `visit` until it returns
+/// `false`, reading into one reused byte buffer. This is for readers that
+/// usually stop after a few rows; files read to the end use `fs::read` and
+/// `jsonl_rows` instead.
+pub(super) fn visit_jsonl_rows(
+    mut reader: impl BufRead,
+    mut visit: impl FnMut(&[u8]) -> bool,
+) -> io::Result<()> {
+    let mut line = Vec::new();
+    loop {
+        line.clear();
+        if reader.read_until(b'\n', &mut line)? == 0 {
+            return Ok(());
+        }
+        let row = line.trim_ascii();
+        if !row.is_empty() && !visit(row) {
+            return Ok(());
+        }
+    }
+}
+
+/// Split a JSONL buffer into its non-blank rows. Callers read the whole file
+/// in one call and parse rows in place, rather than copying every line into
+/// its own buffer through a line reader.
+pub(super) fn jsonl_rows(data: &[u8]) -> impl Iterator<Item = &[u8]> {
+    data.split(|&byte| byte == b'\n')
+        .filter(|line| !line.trim_ascii().is_empty())
 }
 
 fn jsonl_health(path: &Path) -> JsonlHealth {
-    let Ok(file) = fs::File::open(path) else {
+    let Ok(data) = fs::read(path) else {
         return JsonlHealth::Invalid;
     };
     let mut valid_rows = 0usize;
     let mut malformed_rows = 0usize;
     let mut valid_after_last_malformed = false;
-    for line in BufReader::new(file).lines() {
-        let Ok(line) = line else {
-            return JsonlHealth::Invalid;
-        };
-        if line.trim().is_empty() {
-            continue;
-        }
-        if serde_json::from_str::<Value>(&line).is_err() {
+    for line in jsonl_rows(&data) {
+        if !is_json_row(line) {
             malformed_rows += 1;
             valid_after_last_malformed = false;
         } else {
@@ -241,36 +283,53 @@ fn jsonl_health(path: &Path) -> JsonlHealth {
     }
 }
 
+/// Whether a row (or a whole JSON file) would parse as a `Value`. Every
+/// changed file is checked before it is parsed for real, so rows are only
+/// validated here: skipping them with `IgnoredAny` builds no maps or strings.
+/// `IgnoredAny` does not check UTF-8 inside strings, so that is checked up
+/// front.
+fn is_json_row(line: &[u8]) -> bool {
+    std::str::from_utf8(line).is_ok_and(|line| serde_json::from_str::<IgnoredAny>(line).is_ok())
+}
+
 pub(super) fn content_texts(content: &Value) -> Vec<String> {
-    match content {
-        Value::String(text) if !text.is_empty() => vec![text.clone()],
-        Value::Array(parts) => parts
-            .iter()
-            .filter_map(|part| {
-                text_from_part(part).or_else(|| part.as_str().map(ToString::to_string))
-            })
-            .filter(|text| !text.is_empty())
-            .collect(),
-        _ => Vec::new(),
-    }
+    content_strs(content).map(ToString::to_string).collect()
 }
 
-pub(super) fn text_from_part(part: &Value) -> Option<String> {
-    if let Some(text) = part.get("text").and_then(Value::as_str) {
-        return Some(text.to_string());
-    }
-    if let Some(text) = part.get("input_text").and_then(Value::as_str) {
-        return Some(text.to_string());
-    }
-    None
+/// Borrowing `content_texts`, for parsers that copy each text straight into
+/// the conversation and would otherwise allocate it twice.
+pub(super) fn content_strs(content: &Value) -> impl Iterator<Item = &str> {
+    let (text, parts) = match content {
+        Value::String(text) => (Some(text.as_str()), &[][..]),
+        Value::Array(parts) => (None, parts.as_slice()),
+        _ => (None, &[][..]),
+    };
+    text.into_iter()
+        .chain(
+            parts
+                .iter()
+                .filter_map(|part| part_str(part).or_else(|| part.as_str())),
+        )
+        .filter(|text| !text.is_empty())
+}
+
+pub(super) fn part_str(part: &Value) -> Option<&str> {
+    part.get("text")
+        .and_then(Value::as_str)
+        .or_else(|| part.get("input_text").and_then(Value::as_str))
 }
 
 pub(super) fn string_at(value: &Value, path: &[&str]) -> String {
+    str_at(value, path).to_string()
+}
+
+/// Borrowing `string_at`, for values that are only compared or dispatched on.
+pub(super) fn str_at<'a>(value: &'a Value, path: &[&str]) -> &'a str {
     let mut current = value;
     for key in path {
         current = current.get(*key).unwrap_or(&Value::Null);
     }
-    current.as_str().unwrap_or_default().to_string()
+    current.as_str().unwrap_or_default()
 }
 
 pub(super) fn value_i64_at(value: &Value, path: &[&str]) -> Option<i64> {
@@ -363,6 +422,18 @@ pub(super) fn timestamp_from_ms(value: Option<i64>) -> Option<DateTime<Local>> {
     Local.timestamp_millis_opt(value).single()
 }
 
+/// `timestamp_from_ms` as refresh seconds, for mtimes that are only compared.
+/// It yields exactly what `datetime_to_seconds` would, without the local
+/// offset lookup building a `DateTime<Local>` costs.
+pub(super) fn seconds_from_ms(value: Option<i64>) -> Option<f64> {
+    let value = value?;
+    if value <= 0 {
+        return None;
+    }
+    let timestamp = DateTime::from_timestamp_millis(value)?;
+    Some(timestamp.timestamp() as f64 + f64::from(timestamp.timestamp_subsec_nanos()) / 1e9)
+}
+
 pub(super) fn timestamp_from_seconds(value: Option<i64>) -> Option<DateTime<Local>> {
     let value = value?;
     if value <= 0 {
@@ -437,6 +508,38 @@ mod tests {
         );
     }
 
+    #[test]
+    fn visit_jsonl_rows_skips_blank_rows_and_stops_when_asked() {
+        let data: &[u8] = b"{\"a\":1}\r\n\n  \n{\"b\":2}\n{\"c\":3}";
+        let mut rows = Vec::new();
+        visit_jsonl_rows(data, |row| {
+            rows.push(row.to_vec());
+            rows.len() < 2
+        })
+        .unwrap();
+        assert_eq!(rows, [b"{\"a\":1}".to_vec(), b"{\"b\":2}".to_vec()]);
+    }
+
+    #[test]
+    fn json_row_check_agrees_with_value_parsing() {
+        let rows: [&[u8]; 6] = [
+            b"{\"message\":{\"content\":[{\"text\":\"hi \\u00e9\"}]}}",
+            b"[1, 2.5, null, true]",
+            b"{\"unterminated\": ",
+            b"{\"a\":1} trailing",
+            b"{\"bad\":\"\xff\"}",
+            b"{\"escape\":\"\\q\"}",
+        ];
+        for row in rows {
+            assert_eq!(
+                is_json_row(row),
+                serde_json::from_slice::<Value>(row).is_ok(),
+                "{}",
+                String::from_utf8_lossy(row)
+            );
+        }
+    }
+
     #[test]
     fn mtime_decreases_trigger_incremental_updates() {
         let mut known = KnownSessions::new();
@@ -581,6 +684,27 @@ mod tests {
         );
     }
 
+    #[test]
+    fn seconds_from_ms_matches_the_local_datetime_round_trip() {
+        for value in [1, 999, 1_720_000_000_123, 1_720_000_000_999] {
+            assert_eq!(
+                seconds_from_ms(Some(value)),
+                timestamp_from_ms(Some(value)).map(datetime_to_seconds)
+            );
+        }
+        assert_eq!(seconds_from_ms(Some(0)), None);
+        assert_eq!(seconds_from_ms(None), None);
+    }
+
+    #[test]
+    fn push_message_separates_messages_with_blank_lines() {
+        let mut conversation = String::new();
+        push_message(&mut conversation, "» ", "question");
+        push_message(&mut conversation, "  ", "answer");
+
+        assert_eq!(conversation, "» question\n\n  answer");
+    }
+
     #[test]
     fn failed_incremental_scans_do_not_delete_known_sessions() {
         let scan = failed_incremental_scan("codex");
@@ -1,20 +1,31 @@
 use std::collections::HashMap;
 use std::fs;
-use std::io::{BufRead, BufReader};
+use std::io::BufReader;
 use std::path::{Path, PathBuf};
 
+use rayon::prelude::*;
+use serde::Deserialize;
 use serde_json::Value;
 
 use crate::config;
 use crate::model::{RawAdapterStats, Session, file_mtime_seconds, file_timestamp, truncate_title};
 
 use super::shared::{
-    IncrementalParse, SessionFileScan, build_resume_command, content_texts,
+    IncrementalParse, SessionFileScan, build_resume_command, content_strs,
     incremental_parse_from_option, incremental_parse_jsonl_with_partial_check, incremental_scan,
-    json_file_has_parse_errors, parse_datetime, raw_stats_for_tree, string_at,
+    is_dir_entry, json_file_has_parse_errors, jsonl_rows, parse_datetime, push_message,
+    raw_stats_for_tree, str_at, string_at, visit_jsonl_rows,
 };
 use super::{Adapter, IncrementalScan, KnownSessions, SessionCallback};
 
+/// The only metadata field the scan needs. Deserializing into this skips the
+/// rest of `meta.json` without building values for it.
+#[derive(Deserialize)]
+struct VibeMetaId {
+    #[serde(default)]
+    session_id: Value,
+}
+
 #[derive(Debug, Clone)]
 pub struct VibeAdapter {
     sessions_dir: PathBuf,
@@ -44,16 +55,13 @@ impl Adapter for VibeAdapter {
         let Ok(entries) = fs::read_dir(&self.sessions_dir) else {
             return Vec::new();
         };
-        entries
+        let session_dirs: Vec<_> = entries
             .filter_map(Result::ok)
+            .filter(is_session_dir)
             .map(|entry| entry.path())
-            .filter(|path| {
-                path.is_dir()
-                    && path
-                        .file_name()
-                        .and_then(|n| n.to_str())
-                        .is_some_and(|name| name.starts_with("session_"))
-            })
+            .collect();
+        session_dirs
+            .into_par_iter()
             .filter_map(|path| self.parse_session(&path))
             .collect()
     }
@@ -118,35 +126,26 @@ impl VibeAdapter {
                 complete = false;
                 continue;
             };
-            let session_dir = entry.path();
-            if !session_dir.is_dir()
-                || !session_dir
-                    .file_name()
-                    .and_then(|name| name.to_str())
-                    .is_some_and(|name| name.starts_with("session_"))
-            {
+            if !is_session_dir(&entry) {
                 continue;
             }
+            let session_dir = entry.path();
             let metadata_file = session_dir.join("meta.json");
             let Ok(metadata_data) = fs::read(&metadata_file) else {
                 complete = false;
                 continue;
             };
-            let Ok(metadata) = serde_json::from_slice::<Value>(&metadata_data) else {
+            let Ok(metadata) = serde_json::from_slice::<VibeMetaId>(&metadata_data) else {
                 complete = false;
                 continue;
             };
-            let session_id = {
-                let id = string_at(&metadata, &["session_id"]);
-                if id.is_empty() {
-                    session_dir
-                        .file_name()
-                        .and_then(|name| name.to_str())
-                        .unwrap_or_default()
-                        .to_string()
-                } else {
-                    id
-                }
+            let session_id = match metadata.session_id.as_str().unwrap_or_default() {
+                "" => session_dir
+                    .file_name()
+                    .and_then(|name| name.to_str())
+                    .unwrap_or_default()
+                    .to_string(),
+                id => id.to_string(),
             };
             current_files.insert(
                 session_id,
@@ -183,15 +182,13 @@ impl VibeAdapter {
             .unwrap_or_else(|| file_timestamp(&metadata_file));
         let mut title = string_at(&metadata, &["title"]);
 
-        let mut messages = Vec::new();
+        let mut conversation = String::new();
+        let mut message_count = 0usize;
         let mut first_user = String::new();
         if messages_file.exists() {
-            let file = fs::File::open(&messages_file).ok()?;
-            for line in BufReader::new(file).lines().map_while(Result::ok) {
-                if line.trim().is_empty() {
-                    continue;
-                }
-                let Ok(msg) = serde_json::from_str::<Value>(&line) else {
+            let bytes = fs::read(&messages_file).ok()?;
+            for line in jsonl_rows(&bytes) {
+                let Ok(msg) = serde_json::from_slice::<Value>(line) else {
                     continue;
                 };
                 let role = string_at(&msg, &["role"]);
@@ -200,11 +197,12 @@ impl VibeAdapter {
                 }
                 let role_prefix = if role == "user" { "» " } else { "  " };
                 if let Some(content) = msg.get("content") {
-                    for text in content_texts(content) {
+                    for text in content_strs(content) {
                         if role == "user" && first_user.is_empty() {
-                            first_user = text.clone();
+                            first_user = text.to_string();
                         }
-                        messages.push(format!("{role_prefix}{text}"));
+                        push_message(&mut conversation, role_prefix, text);
+                        message_count += 1;
                     }
                 }
             }
@@ -224,8 +222,8 @@ impl VibeAdapter {
             title,
             directory,
             timestamp,
-            messages.join("\n\n"),
-            messages.len(),
+            conversation,
+            message_count,
         );
         session.mtime = vibe_session_mtime(session_dir);
         session.yolo = yolo;
@@ -249,6 +247,16 @@ impl VibeAdapter {
     }
 }
 
+/// Checks the entry's name before its type, so most non-session entries are
+/// rejected without touching their metadata.
+fn is_session_dir(entry: &fs::DirEntry) -> bool {
+    entry
+        .file_name()
+        .to_str()
+        .is_some_and(|name| name.starts_with("session_"))
+        && is_dir_entry(entry)
+}
+
 fn vibe_session_mtime(session_dir: &Path) -> f64 {
     file_mtime_seconds(&session_dir.join("meta.json"))
         .max(file_mtime_seconds(&session_dir.join("messages.jsonl")))
@@ -258,20 +266,18 @@ fn vibe_messages_have_user_content(path: &Path) -> bool {
     let Ok(file) = fs::File::open(path) else {
         return false;
     };
-    BufReader::new(file)
-        .lines()
-        .map_while(Result::ok)
-        .any(|line| {
-            let Ok(message) = serde_json::from_str::<Value>(&line) else {
-                return false;
-            };
-            string_at(&message, &["role"]) == "user"
-                && message.get("content").is_some_and(|content| {
-                    content_texts(content)
-                        .iter()
-                        .any(|text| !text.trim().is_empty())
-                })
-        })
+    let mut found = false;
+    let _ = visit_jsonl_rows(BufReader::new(file), |row| {
+        let Ok(message) = serde_json::from_slice::<Value>(row) else {
+            return true;
+        };
+        found = str_at(&message, &["role"]) == "user"
+            && message
+                .get("content")
+                .is_some_and(|content| content_strs(content).any(|text| !text.trim().is_empty()));
+        !found
+    });
+    found
 }
 
 #[cfg(test)]
@@ -1,11 +1,14 @@
+use std::collections::hash_map::Entry;
+use std::collections::{BTreeMap, HashMap};
 use std::fs::{self, File, OpenOptions};
 use std::path::{Path, PathBuf};
-use std::sync::Arc;
+use std::sync::{Arc, Mutex, PoisonError};
 use std::time::{Duration, Instant};
 
 use anyhow::{Context, Result};
 use fs4::fs_std::FileExt;
-use tantivy::collector::{Count, TopDocs};
+use tantivy::collector::{Count, DocSetCollector, TopDocs};
+use tantivy::indexer::UserOperation;
 use tantivy::query::{AllQuery, TermQuery};
 use tantivy::schema::{IndexRecordOption, TantivyDocument};
 use tantivy::{DocAddress, Index, IndexReader, IndexWriter, Order, ReloadPolicy, Score, Term};
@@ -93,12 +96,15 @@ pub struct RefreshSummary {
     pub deleted: usize,
 }
 
+type AgentCounts = BTreeMap<String, usize>;
+
 #[derive(Clone)]
 pub struct SessionIndex {
     index: Index,
     reader: Arc<IndexReader>,
     path: PathBuf,
     fields: schema::IndexFields,
+    agent_counts: Arc<Mutex<Option<(u64, Arc<AgentCounts>)>>>,
 }
 
 impl SessionIndex {
@@ -145,6 +151,7 @@ impl SessionIndex {
             reader: Arc::new(reader),
             path,
             fields,
+            agent_counts: Arc::default(),
         })
     }
 
@@ -158,14 +165,26 @@ impl SessionIndex {
         let mut writer: IndexWriter<TantivyDocument> =
             self.index.writer_with_num_threads(1, 128_000_000)?;
         writer.delete_all_documents()?;
-        for session in &sessions {
-            writer.add_document(document::session_document(self.fields, session))?;
+        let count = sessions.len();
+        // Documents go to the indexing thread a batch per send rather than
+        // one per send; bounded batches keep it busy while the rest are built.
+        let mut sessions = sessions.into_iter();
+        loop {
+            let batch: Vec<_> = sessions
+                .by_ref()
+                .take(INDEX_REFRESH_BATCH_SIZE)
+                .map(|session| UserOperation::Add(document::session_document(self.fields, session)))
+                .collect();
+            if batch.is_empty() {
+                break;
+            }
+            writer.run(batch)?;
         }
         writer.commit()?;
         self.reader.reload()?;
         Ok(RefreshSummary {
-            sessions: sessions.len(),
-            new_or_modified: sessions.len(),
+            sessions: count,
+            new_or_modified: count,
             deleted: 0,
         })
     }
@@ -212,12 +231,12 @@ impl SessionIndex {
     /// Read `(agent, id) -> mtime` from columnar fast fields. This runs on
     /// every launch, so it must not fetch stored documents: that would
     /// decompress every session's conversation content just to reach three
-    /// small fields.
+    /// small fields. A segment holds only a handful of agents, so each agent
+    /// ordinal is decoded from the term dictionary once, not once per doc.
     pub fn known_sessions(&self) -> Result<KnownSessions> {
         let searcher = self.searcher()?;
-        let mut known = KnownSessions::new();
+        let mut known = KnownSessions::with_capacity(searcher.num_docs() as usize);
         let mut id = String::new();
-        let mut agent = String::new();
         for segment_reader in searcher.segment_readers() {
             let fast_fields = segment_reader.fast_fields();
             let ids = fast_fields.str("id")?.context("id fast field missing")?;
@@ -226,6 +245,7 @@ impl SessionIndex {
                 .context("agent fast field missing")?;
             let mtimes = fast_fields.f64("mtime")?;
             let alive = segment_reader.alive_bitset();
+            let mut agent_names: HashMap<u64, Option<String>> = HashMap::new();
             for doc in 0..segment_reader.max_doc() {
                 if alive.is_some_and(|bitset| !bitset.is_alive(doc)) {
                     continue;
@@ -236,9 +256,19 @@ impl SessionIndex {
                 let Some(agent_ord) = agents.term_ords(doc).next() else {
                     continue;
                 };
+                let agent = match agent_names.entry(agent_ord) {
+                    Entry::Occupied(entry) => entry.into_mut(),
+                    Entry::Vacant(entry) => {
+                        let mut agent = String::new();
+                        let found = agents.ord_to_str(agent_ord, &mut agent)?;
+                        entry.insert(found.then_some(agent))
+                    }
+                };
+                let Some(agent) = agent else {
+                    continue;
+                };
                 id.clear();
-                agent.clear();
-                if !ids.ord_to_str(id_ord, &mut id)? || !agents.ord_to_str(agent_ord, &mut agent)? {
+                if !ids.ord_to_str(id_ord, &mut id)? {
                     continue;
                 }
                 let mtime = mtimes.first(doc).unwrap_or(0.0);
@@ -249,9 +279,13 @@ impl SessionIndex {
     }
 
     pub fn all_sessions(&self) -> Result<Vec<Session>> {
+        self.sessions_matching(&AllQuery)
+    }
+
+    fn sessions_matching(&self, query: &dyn tantivy::query::Query) -> Result<Vec<Session>> {
         let searcher = self.searcher()?;
         let mut sessions = Vec::new();
-        for (_, address) in self.search_all_addresses(&searcher)? {
+        for address in self.search_all_addresses(&searcher, query)? {
             let doc = searcher.doc::<TantivyDocument>(address)?;
             if let Some(session) = document::doc_to_session(self.fields, &doc) {
                 sessions.push(session);
@@ -260,6 +294,19 @@ impl SessionIndex {
         Ok(sort_and_dedupe_sessions(sessions))
     }
 
+    /// Stored conversation content of one session, for callers that listed
+    /// sessions without it.
+    pub fn session_content(&self, agent: &str, id: &str) -> Result<Option<String>> {
+        let term =
+            Term::from_field_text(self.fields.session_key, &document::session_key(agent, id));
+        let query = TermQuery::new(term, IndexRecordOption::Basic);
+        Ok(self
+            .sessions_matching(&query)?
+            .into_iter()
+            .next()
+            .map(|session| session.content))
+    }
+
     pub fn total_len(&self) -> Result<usize> {
         let searcher = self.searcher()?;
         Ok(searcher.num_docs() as usize)
@@ -267,26 +314,39 @@ impl SessionIndex {
 
     pub fn count_for_agent(&self, agent: Option<&str>) -> Result<usize> {
         let searcher = self.searcher()?;
-        let count = match agent {
-            Some(agent) => {
-                let term = Term::from_field_text(self.fields.agent, agent);
-                let query = TermQuery::new(term, IndexRecordOption::Basic);
-                searcher.search(&query, &Count)?
-            }
-            None => searcher.search(&AllQuery, &Count)?,
-        };
-        Ok(count)
+        match agent {
+            Some(agent) => Ok(self
+                .agent_counts(&searcher)?
+                .get(agent)
+                .copied()
+                .unwrap_or(0)),
+            None => Ok(searcher.num_docs() as usize),
+        }
     }
 
+    /// Agents with at least one live session.
     pub fn agents_with_sessions(&self) -> Result<Vec<String>> {
-        let mut agents: Vec<_> = self
-            .all_sessions()?
-            .into_iter()
-            .map(|session| session.agent)
-            .collect();
-        agents.sort();
-        agents.dedup();
-        Ok(agents)
+        let searcher = self.searcher()?;
+        Ok(self.agent_counts(&searcher)?.keys().cloned().collect())
+    }
+
+    /// Live sessions per agent for `searcher`'s generation. The TUI asks for
+    /// every agent's count on each frame it draws, so the counts are read once
+    /// per reload and shared by all clones of this index.
+    fn agent_counts(&self, searcher: &tantivy::Searcher) -> Result<Arc<AgentCounts>> {
+        let generation = searcher.generation().generation_id();
+        let mut cached = self
+            .agent_counts
+            .lock()
+            .unwrap_or_else(PoisonError::into_inner);
+        if let Some((cached_generation, counts)) = cached.as_ref()
+            && *cached_generation == generation
+        {
+            return Ok(Arc::clone(counts));
+        }
+        let counts = Arc::new(read_agent_counts(searcher)?);
+        *cached = Some((generation, Arc::clone(&counts)));
+        Ok(counts)
     }
 
     pub fn search(
@@ -306,6 +366,31 @@ impl SessionIndex {
         directory_filter: Option<&str>,
         offset: usize,
         limit: usize,
+    ) -> Result<Vec<SearchHit>> {
+        self.search_hits(query, agent_filter, directory_filter, offset, limit, true)
+    }
+
+    /// Same hits as `search_with_offset`, with `content` left empty: the CLI
+    /// table and JSON listings never print it.
+    pub fn list_with_offset(
+        &self,
+        query: &str,
+        agent_filter: Option<&str>,
+        directory_filter: Option<&str>,
+        offset: usize,
+        limit: usize,
+    ) -> Result<Vec<SearchHit>> {
+        self.search_hits(query, agent_filter, directory_filter, offset, limit, false)
+    }
+
+    fn search_hits(
+        &self,
+        query: &str,
+        agent_filter: Option<&str>,
+        directory_filter: Option<&str>,
+        offset: usize,
+        limit: usize,
+        with_content: bool,
     ) -> Result<Vec<SearchHit>> {
         if limit == 0 {
             return Ok(Vec::new());
@@ -322,6 +407,7 @@ impl SessionIndex {
                 &searcher,
                 hits.into_iter()
                     .map(|(score, addr)| (score.unwrap_or_default() as f32, addr)),
+                with_content,
             )
         } else {
             let hits: Vec<(Score, DocAddress)> = searcher.search(
@@ -330,7 +416,7 @@ impl SessionIndex {
                     .and_offset(offset)
                     .order_by_score(),
             )?;
-            self.hits_to_sessions(&searcher, hits.into_iter())
+            self.hits_to_sessions(&searcher, hits.into_iter(), with_content)
         }
     }
 
@@ -349,11 +435,18 @@ impl SessionIndex {
         self.stats_for(None, None)
     }
 
+    /// An agent filter becomes a term query, so other agents' documents are
+    /// never fetched; `directory` is a substring match and filters afterwards.
     pub fn stats_for(&self, agent: Option<&str>, directory: Option<&str>) -> Result<IndexStats> {
-        let sessions = self
-            .all_sessions()?
+        let sessions = match agent {
+            Some(agent) => {
+                let term = Term::from_field_text(self.fields.agent, agent);
+                self.sessions_matching(&TermQuery::new(term, IndexRecordOption::Basic))?
+            }
+            None => self.all_sessions()?,
+        };
+        let sessions = sessions
             .into_iter()
-            .filter(|session| agent.is_none_or(|agent| session.agent == agent))
             .filter(|session| directory.is_none_or(|dir| session.directory.contains(dir)))
             .collect();
         Ok(stats::build(sessions, &self.path))
@@ -364,7 +457,7 @@ impl SessionIndex {
     #[cfg(test)]
     pub(crate) fn update_sessions(&self, sessions: &[Session]) -> Result<()> {
         let mut updater = self.updater(None);
-        updater.update_sessions(sessions)?;
+        updater.update_sessions(sessions.to_vec())?;
         updater.finish()
     }
 
@@ -422,28 +515,38 @@ impl SessionIndex {
         Ok((query, has_text))
     }
 
+    /// Every match, in storage order. Bounded listings go through `TopDocs`;
+    /// callers that take all matches re-sort by timestamp after deduping, so
+    /// ranking them here would only buy an N-sized heap and fetches that jump
+    /// between doc-store blocks instead of reading each block once.
     fn search_all_addresses(
         &self,
         searcher: &tantivy::Searcher,
-    ) -> Result<Vec<(Option<f64>, DocAddress)>> {
-        let total = searcher.num_docs() as usize;
-        if total == 0 {
-            return Ok(Vec::new());
-        }
-        let collector =
-            TopDocs::with_limit(total).order_by_fast_field::<f64>("timestamp", Order::Desc);
-        Ok(searcher.search(&AllQuery, &collector)?)
+        query: &dyn tantivy::query::Query,
+    ) -> Result<Vec<DocAddress>> {
+        let mut addresses: Vec<_> = searcher
+            .search(query, &DocSetCollector)?
+            .into_iter()
+            .collect();
+        addresses.sort_unstable();
+        Ok(addresses)
     }
 
     fn hits_to_sessions(
         &self,
         searcher: &tantivy::Searcher,
         hits: impl Iterator<Item = (f32, DocAddress)>,
+        with_content: bool,
     ) -> Result<Vec<SearchHit>> {
+        let to_session = if with_content {
+            document::doc_to_session
+        } else {
+            document::doc_to_listed_session
+        };
         let mut sessions = Vec::new();
         for (score, address) in hits {
             let doc = searcher.doc::<TantivyDocument>(address)?;
-            if let Some(session) = document::doc_to_session(self.fields, &doc) {
+            if let Some(session) = to_session(self.fields, &doc) {
                 sessions.push(SearchHit { session, score });
             }
         }
@@ -451,6 +554,36 @@ impl SessionIndex {
     }
 }
 
+/// Like `known_sessions`, this reads the `agent` fast field so the TUI's
+/// counts and filter tabs never load stored conversation content.
+fn read_agent_counts(searcher: &tantivy::Searcher) -> Result<AgentCounts> {
+    let mut counts = AgentCounts::new();
+    let mut agent = String::new();
+    for segment_reader in searcher.segment_readers() {
+        let column = segment_reader
+            .fast_fields()
+            .str("agent")?
+            .context("agent fast field missing")?;
+        let alive = segment_reader.alive_bitset();
+        let mut ords: BTreeMap<u64, usize> = BTreeMap::new();
+        for doc in 0..segment_reader.max_doc() {
+            if alive.is_some_and(|bitset| !bitset.is_alive(doc)) {
+                continue;
+            }
+            if let Some(ord) = column.term_ords(doc).next() {
+                *ords.entry(ord).or_default() += 1;
+            }
+        }
+        for (ord, count) in ords {
+            agent.clear();
+            if column.ord_to_str(ord, &mut agent)? {
+                *counts.entry(agent.clone()).or_default() += count;
+            }
+        }
+    }
+    Ok(counts)
+}
+
 pub(crate) struct IndexUpdater<'a> {
     index: &'a SessionIndex,
     writer: Option<IndexWriter<TantivyDocument>>,
@@ -460,21 +593,28 @@ pub(crate) struct IndexUpdater<'a> {
 }
 
 impl IndexUpdater<'_> {
-    pub(crate) fn update_sessions(&mut self, sessions: &[Session]) -> Result<()> {
+    pub(crate) fn update_sessions(&mut self, sessions: Vec<Session>) -> Result<()> {
         if sessions.is_empty() {
             return Ok(());
         }
         let fields = self.index.fields;
         let writer = self.writer()?;
-        for session in sessions {
-            writer.delete_term(Term::from_field_text(
+        // One `run` hands the whole batch to the indexing thread at once. Its
+        // deletes only reach documents from before the batch, so each session's
+        // replacement survives the delete of its old version.
+        let mut operations = Vec::with_capacity(sessions.len() * 2);
+        for session in &sessions {
+            operations.push(UserOperation::Delete(Term::from_field_text(
                 fields.session_key,
                 &document::session_key(&session.agent, &session.id),
-            ));
-        }
-        for session in sessions {
-            writer.add_document(document::session_document(fields, session))?;
+            )));
         }
+        operations.extend(
+            sessions
+                .into_iter()
+                .map(|session| UserOperation::Add(document::session_document(fields, session))),
+        );
+        writer.run(operations)?;
         self.dirty = true;
         self.maybe_commit()
     }
@@ -610,6 +750,48 @@ mod tests {
         );
     }
 
+    #[test]
+    fn agents_with_sessions_skips_deleted_documents() {
+        let temp = tempdir().unwrap();
+        let index = SessionIndex::open(temp.path().join("index")).unwrap();
+        index
+            .update_sessions(&[
+                session("a", "codex", "One", "/work/a", "x"),
+                session("b", "claude", "Two", "/work/b", "y"),
+                session("c", "codex", "Three", "/work/c", "z"),
+            ])
+            .unwrap();
+        let mut updater = index.updater(None);
+        updater
+            .delete_sessions("claude", &["b".to_string()])
+            .unwrap();
+        updater.finish().unwrap();
+
+        assert_eq!(index.agents_with_sessions().unwrap(), vec!["codex"]);
+    }
+
+    #[test]
+    fn agent_counts_follow_reloads() {
+        let temp = tempdir().unwrap();
+        let index = SessionIndex::open(temp.path().join("index")).unwrap();
+        index
+            .update_sessions(&[session("a", "codex", "One", "/work/a", "x")])
+            .unwrap();
+        assert_eq!(index.count_for_agent(Some("codex")).unwrap(), 1);
+        assert_eq!(index.count_for_agent(Some("claude")).unwrap(), 0);
+
+        index
+            .update_sessions(&[
+                session("b", "codex", "Two", "/work/b", "y"),
+                session("c", "claude", "Three", "/work/c", "z"),
+            ])
+            .unwrap();
+
+        assert_eq!(index.count_for_agent(Some("codex")).unwrap(), 2);
+        assert_eq!(index.count_for_agent(Some("claude")).unwrap(), 1);
+        assert_eq!(index.count_for_agent(None).unwrap(), 3);
+    }
+
     #[test]
     fn updates_only_matching_agent_session_id() {
         let temp = tempdir().unwrap();
@@ -683,6 +865,44 @@ mod tests {
         assert_eq!(results[0].session.id, "a");
     }
 
+    #[test]
+    fn fuzzy_search_splits_terms_like_the_indexed_text() {
+        let temp = tempdir().unwrap();
+        let index = SessionIndex::open(temp.path().join("index")).unwrap();
+        index
+            .update_sessions(&[session(
+                "a",
+                "claude",
+                "Authentication bug",
+                "/work/a",
+                "refresh token failure",
+            )])
+            .unwrap();
+
+        let results = index.search("Authentcation/token", None, None, 10).unwrap();
+        assert_eq!(results.len(), 1);
+        assert_eq!(results[0].session.id, "a");
+    }
+
+    #[test]
+    fn three_character_terms_match_as_prefixes_without_typos() {
+        let temp = tempdir().unwrap();
+        let index = SessionIndex::open(temp.path().join("index")).unwrap();
+        index
+            .update_sessions(&[session(
+                "a",
+                "claude",
+                "Authentication bug",
+                "/work/a",
+                "refresh token failure",
+            )])
+            .unwrap();
+
+        assert_eq!(index.search("aut", None, None, 10).unwrap().len(), 1);
+        assert_eq!(index.search("tok", None, None, 10).unwrap().len(), 1);
+        assert!(index.search("tzk", None, None, 10).unwrap().is_empty());
+    }
+
     #[test]
     fn updater_without_interval_commits_only_on_finish() {
         let temp = tempdir().unwrap();
@@ -693,7 +913,7 @@ mod tests {
 
         let mut updater = index.updater(None);
         updater
-            .update_sessions(&[session("b", "codex", "New", "/work/b", "new content")])
+            .update_sessions(vec![session("b", "codex", "New", "/work/b", "new content")])
             .unwrap();
         updater
             .delete_sessions("claude", &["a".to_string()])
@@ -725,7 +945,9 @@ mod tests {
 
         let mut updater = index.updater(Some(Duration::ZERO));
         updater
-            .update_sessions(&[session("a", "claude", "Streamed", "/work/a", "content")])
+            .update_sessions(vec![session(
+                "a", "claude", "Streamed", "/work/a", "content",
+            )])
             .unwrap();
 
         assert_eq!(
@@ -736,6 +958,25 @@ mod tests {
         updater.finish().unwrap();
     }
 
+    #[test]
+    fn stats_for_agent_counts_only_that_agent() {
+        let temp = tempdir().unwrap();
+        let index = SessionIndex::open(temp.path().join("index")).unwrap();
+        index
+            .update_sessions(&[
+                session("a", "codex", "One", "/work/api", "x"),
+                session("b", "claude", "Two", "/work/api", "y"),
+                session("c", "codex", "Three", "/work/web", "z"),
+            ])
+            .unwrap();
+
+        let stats = index.stats_for(Some("codex"), Some("api")).unwrap();
+
+        assert_eq!(stats.total_sessions, 1);
+        assert_eq!(stats.sessions_by_agent.get("codex"), Some(&1));
+        assert!(!stats.sessions_by_agent.contains_key("claude"));
+    }
+
     #[test]
     fn stats_include_content_bytes_and_activity_buckets() {
         let temp = tempdir().unwrap();
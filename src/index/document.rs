@@ -1,19 +1,21 @@
 use chrono::{DateTime, Local, TimeZone};
 use tantivy::doc;
-use tantivy::schema::{Field, TantivyDocument, Value};
+use tantivy::schema::{TantivyDocument, Value};
 
 use crate::model::Session;
 
 use super::schema::IndexFields;
 
-pub(super) fn session_document(fields: IndexFields, session: &Session) -> TantivyDocument {
+/// Takes the session by value: its strings, the conversation above all, move
+/// into the document instead of being copied next to a soon-dropped original.
+pub(super) fn session_document(fields: IndexFields, session: Session) -> TantivyDocument {
     doc!(
-        fields.id => session.id.clone(),
         fields.session_key => session_key(&session.agent, &session.id),
-        fields.title => session.title.clone(),
-        fields.directory => session.directory.clone(),
-        fields.agent => session.agent.clone(),
-        fields.content => session.content.clone(),
+        fields.id => session.id,
+        fields.title => session.title,
+        fields.directory => session.directory,
+        fields.agent => session.agent,
+        fields.content => session.content,
         fields.timestamp => datetime_to_seconds(session.timestamp),
         fields.message_count => session.message_count as i64,
         fields.mtime => session.mtime,
@@ -22,41 +24,80 @@ pub(super) fn session_document(fields: IndexFields, session: &Session) -> Tantiv
 }
 
 pub(super) fn doc_to_session(fields: IndexFields, doc: &TantivyDocument) -> Option<Session> {
-    let timestamp = number(doc, fields.timestamp)?;
-    let mut session = Session::new(
-        text(doc, fields.id)?.to_string(),
-        text(doc, fields.agent).unwrap_or_default().to_string(),
-        text(doc, fields.title).unwrap_or_default().to_string(),
-        text(doc, fields.directory).unwrap_or_default().to_string(),
-        Local.timestamp_opt(timestamp as i64, 0).single()?,
-        text(doc, fields.content).unwrap_or_default().to_string(),
-        integer(doc, fields.message_count).unwrap_or(0) as usize,
-    );
-    session.mtime = number(doc, fields.mtime).unwrap_or(0.0);
-    session.yolo = boolean(doc, fields.yolo).unwrap_or(false);
-    Some(session)
+    session_from_doc(StoredFields::read(fields, doc), true)
 }
 
-pub(super) fn datetime_to_seconds(timestamp: DateTime<Local>) -> f64 {
-    timestamp.timestamp() as f64 + f64::from(timestamp.timestamp_subsec_nanos()) / 1e9
+/// For listings that never show the conversation: `content` is by far the
+/// largest stored field, so it is left empty instead of copied out.
+pub(super) fn doc_to_listed_session(fields: IndexFields, doc: &TantivyDocument) -> Option<Session> {
+    session_from_doc(StoredFields::read(fields, doc), false)
 }
 
-pub(super) fn session_key(agent: &str, id: &str) -> String {
-    format!("{agent}::{id}")
+fn session_from_doc(stored: StoredFields<'_>, with_content: bool) -> Option<Session> {
+    let timestamp = stored.timestamp?;
+    let content = if with_content { stored.content } else { None };
+    let mut session = Session::new(
+        stored.id?.to_string(),
+        stored.agent.unwrap_or_default().to_string(),
+        stored.title.unwrap_or_default().to_string(),
+        stored.directory.unwrap_or_default().to_string(),
+        Local.timestamp_opt(timestamp as i64, 0).single()?,
+        content.unwrap_or_default().to_string(),
+        stored.message_count.unwrap_or(0) as usize,
+    );
+    session.mtime = stored.mtime.unwrap_or(0.0);
+    session.yolo = stored.yolo.unwrap_or(false);
+    Some(session)
 }
 
-pub(super) fn text(doc: &TantivyDocument, field: Field) -> Option<&str> {
-    doc.get_first(field).and_then(|value| value.as_str())
+/// A session's stored values, gathered in one pass over the document rather
+/// than one `get_first` scan of its field list per field.
+#[derive(Default)]
+struct StoredFields<'a> {
+    id: Option<&'a str>,
+    agent: Option<&'a str>,
+    title: Option<&'a str>,
+    directory: Option<&'a str>,
+    content: Option<&'a str>,
+    timestamp: Option<f64>,
+    message_count: Option<i64>,
+    mtime: Option<f64>,
+    yolo: Option<bool>,
 }
 
-pub(super) fn number(doc: &TantivyDocument, field: Field) -> Option<f64> {
-    doc.get_first(field).and_then(|value| value.as_f64())
+impl<'a> StoredFields<'a> {
+    fn read(fields: IndexFields, doc: &'a TantivyDocument) -> Self {
+        let mut stored = Self::default();
+        // `or` keeps the first value of a field, as `get_first` would.
+        for (field, value) in doc.field_values() {
+            if field == fields.id {
+                stored.id = stored.id.or(value.as_str());
+            } else if field == fields.agent {
+                stored.agent = stored.agent.or(value.as_str());
+            } else if field == fields.title {
+                stored.title = stored.title.or(value.as_str());
+            } else if field == fields.directory {
+                stored.directory = stored.directory.or(value.as_str());
+            } else if field == fields.content {
+                stored.content = stored.content.or(value.as_str());
+            } else if field == fields.timestamp {
+                stored.timestamp = stored.timestamp.or(value.as_f64());
+            } else if field == fields.message_count {
+                stored.message_count = stored.message_count.or(value.as_i64());
+            } else if field == fields.mtime {
+                stored.mtime = stored.mtime.or(value.as_f64());
+            } else if field == fields.yolo {
+                stored.yolo = stored.yolo.or(value.as_bool());
+            }
+        }
+        stored
+    }
 }
 
-fn integer(doc: &TantivyDocument, field: Field) -> Option<i64> {
-    doc.get_first(field).and_then(|value| value.as_i64())
+pub(super) fn datetime_to_seconds(timestamp: DateTime<Local>) -> f64 {
+    timestamp.timestamp() as f64 + f64::from(timestamp.timestamp_subsec_nanos()) / 1e9
 }
 
-fn boolean(doc: &TantivyDocument, field: Field) -> Option<bool> {
-    doc.get_first(field).and_then(|value| value.as_bool())
+pub(super) fn session_key(agent: &str, id: &str) -> String {
+    format!("{agent}::{id}")
 }
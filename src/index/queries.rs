@@ -7,6 +7,7 @@ use tantivy::query::{
     RegexQuery, TermQuery, TermSetQuery,
 };
 use tantivy::schema::IndexRecordOption;
+use tantivy::tokenizer::TokenStream;
 use tantivy::{Index, Term};
 
 use crate::query::{DateFilter, DateOp, Filter};
@@ -61,15 +62,21 @@ fn text_query(index: &Index, fields: IndexFields, search_text: &str) -> Result<B
 
     let mut alternatives: Vec<(Occur, Box<dyn Query>)> =
         vec![(Occur::Should, Box::new(boosted_exact))];
-    let fuzzy_parts: Vec<(Occur, Box<dyn Query>)> = search_text
-        .split_whitespace()
+    let fuzzy_parts: Vec<(Occur, Box<dyn Query>)> = content_terms(index, fields, search_text)?
+        .into_iter()
         .filter(|term| term.chars().count() >= 3)
         .map(|term| {
-            let term = term.to_lowercase();
-            let title =
-                FuzzyTermQuery::new_prefix(Term::from_field_text(fields.title, &term), 1, true);
-            let content =
-                FuzzyTermQuery::new_prefix(Term::from_field_text(fields.content, &term), 1, true);
+            let distance = fuzzy_distance(&term);
+            let title = FuzzyTermQuery::new_prefix(
+                Term::from_field_text(fields.title, &term),
+                distance,
+                true,
+            );
+            let content = FuzzyTermQuery::new_prefix(
+                Term::from_field_text(fields.content, &term),
+                distance,
+                true,
+            );
             let fields = BooleanQuery::new(vec![
                 (Occur::Should, Box::new(title) as Box<dyn Query>),
                 (Occur::Should, Box::new(content) as Box<dyn Query>),
@@ -88,6 +95,27 @@ fn text_query(index: &Index, fields: IndexFields, search_text: &str) -> Result<B
     Ok(Box::new(BooleanQuery::new(alternatives)))
 }
 
+/// Split the search text with the analyzer title and content were indexed
+/// with, so fuzzy terms are lowercased and cut at punctuation exactly like the
+/// terms they are compared against (`foo-bar` is `foo` and `bar`, not one
+/// term that can never be within an edit of either).
+fn content_terms(index: &Index, fields: IndexFields, search_text: &str) -> Result<Vec<String>> {
+    let mut analyzer = index.tokenizer_for_field(fields.content)?;
+    let mut stream = analyzer.token_stream(search_text);
+    let mut terms = Vec::new();
+    while stream.advance() {
+        terms.push(stream.token().text.clone());
+    }
+    Ok(terms)
+}
+
+/// One typo is tolerated from four characters up. On a three-character
+/// prefix an edit leaves two fixed characters, which expands to a large share
+/// of the content term dictionary while rarely being what the user meant.
+fn fuzzy_distance(term: &str) -> u8 {
+    if term.chars().count() >= 4 { 1 } else { 0 }
+}
+
 fn directory_text_query(fields: IndexFields, search_text: &str) -> Result<Option<Box<dyn Query>>> {
     let search_text = search_text.trim();
     if search_text.chars().count() < 3 || search_text.split_whitespace().count() != 1 {
@@ -134,25 +162,13 @@ fn directory_query(fields: IndexFields, filter: Option<Filter>) -> Result<Option
     let mut parts: Vec<(Occur, Box<dyn Query>)> = Vec::new();
 
     if !filter.include.is_empty() {
-        let include_parts: Result<Vec<_>> = filter
-            .include
-            .iter()
-            .map(|dir| {
-                let pattern = format!("(?i).*{}.*", regex::escape(dir));
-                Ok((
-                    Occur::Should,
-                    Box::new(RegexQuery::from_pattern(&pattern, fields.directory)?)
-                        as Box<dyn Query>,
-                ))
-            })
-            .collect();
-        parts.push((Occur::Must, Box::new(BooleanQuery::new(include_parts?))));
+        parts.push((Occur::Must, directory_substrings(fields, &filter.include)?));
     }
-
-    for excluded in filter.exclude {
-        let pattern = format!("(?i).*{}.*", regex::escape(&excluded));
-        let query = RegexQuery::from_pattern(&pattern, fields.directory)?;
-        parts.push((Occur::MustNot, Box::new(query)));
+    if !filter.exclude.is_empty() {
+        parts.push((
+            Occur::MustNot,
+            directory_substrings(fields, &filter.exclude)?,
+        ));
     }
     if parts.is_empty() {
         return Ok(None);
@@ -163,6 +179,18 @@ fn directory_query(fields: IndexFields, filter: Option<Filter>) -> Result<Option
     Ok(Some(Box::new(BooleanQuery::new(parts))))
 }
 
+/// Matches directories containing any of `needles`, case-insensitively. One
+/// alternation walks the directory term dictionary once, however many values
+/// a `dir:a,b` filter lists.
+fn directory_substrings(fields: IndexFields, needles: &[String]) -> Result<Box<dyn Query>> {
+    let alternatives: Vec<_> = needles.iter().map(|dir| regex::escape(dir)).collect();
+    let pattern = format!("(?i).*(?:{}).*", alternatives.join("|"));
+    Ok(Box::new(RegexQuery::from_pattern(
+        &pattern,
+        fields.directory,
+    )?))
+}
+
 fn date_query(fields: IndexFields, date: &DateFilter) -> Box<dyn Query> {
     let cutoff = datetime_to_seconds(date.cutoff);
     match date.op {
@@ -45,11 +45,11 @@ pub(super) fn build_schema() -> Schema {
     let mut schema = Schema::builder();
     // id, agent, and mtime are fast fields so known_sessions() can read them
     // from columnar storage without decompressing stored conversation content.
-    schema.add_text_field("id", raw_text_options().set_fast(Some("raw")));
-    schema.add_text_field("session_key", raw_text_options());
+    schema.add_text_field("id", keyword_options().set_fast(Some("raw")));
+    schema.add_text_field("session_key", keyword_options());
     schema.add_text_field("title", TEXT | STORED);
     schema.add_text_field("directory", raw_text_options());
-    schema.add_text_field("agent", raw_text_options().set_fast(Some("raw")));
+    schema.add_text_field("agent", keyword_options().set_fast(Some("raw")));
     schema.add_text_field("content", TEXT | STORED);
     schema.add_f64_field(
         "timestamp",
@@ -78,9 +78,20 @@ pub(super) fn write_schema_version(path: &Path) -> Result<()> {
 }
 
 fn raw_text_options() -> TextOptions {
+    raw_options(IndexRecordOption::WithFreqsAndPositions)
+}
+
+/// Exact-match keys (id, session key, agent) are only ever looked up as whole
+/// terms, so their postings skip the frequencies and positions that scoring
+/// and phrase queries over `directory` need.
+fn keyword_options() -> TextOptions {
+    raw_options(IndexRecordOption::Basic)
+}
+
+fn raw_options(record: IndexRecordOption) -> TextOptions {
     TextOptions::default().set_stored().set_indexing_options(
         TextFieldIndexing::default()
             .set_tokenizer("raw")
-            .set_index_option(IndexRecordOption::WithFreqsAndPositions),
+            .set_index_option(record),
     )
 }
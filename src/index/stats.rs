@@ -1,4 +1,5 @@
 use std::collections::BTreeMap;
+use std::ops::AddAssign;
 use std::path::{Path, PathBuf};
 
 use chrono::{DateTime, Datelike, Local, Timelike};
@@ -32,18 +33,17 @@ pub(super) fn build(sessions: Vec<Session>, path: &Path) -> IndexStats {
     let mut dir_counts: BTreeMap<String, (usize, usize)> = BTreeMap::new();
     for session in sessions {
         stats.total_messages += session.message_count;
-        *stats
-            .sessions_by_agent
-            .entry(session.agent.clone())
-            .or_default() += 1;
-        *stats
-            .messages_by_agent
-            .entry(session.agent.clone())
-            .or_default() += session.message_count;
-        *stats
-            .content_bytes_by_agent
-            .entry(session.agent.clone())
-            .or_default() += session.content.len() as u64;
+        add_to(&mut stats.sessions_by_agent, &session.agent, 1);
+        add_to(
+            &mut stats.messages_by_agent,
+            &session.agent,
+            session.message_count,
+        );
+        add_to(
+            &mut stats.content_bytes_by_agent,
+            &session.agent,
+            session.content.len() as u64,
+        );
 
         let dir = if session.directory.is_empty() {
             "n/a".to_string()
@@ -71,16 +71,45 @@ pub(super) fn build(sessions: Vec<Session>, path: &Path) -> IndexStats {
             .or_default() += 1;
     }
 
-    let mut dirs: Vec<_> = dir_counts
+    let dirs: Vec<_> = dir_counts
         .into_iter()
         .map(|(dir, (sessions, messages))| (dir, sessions, messages))
         .collect();
-    dirs.sort_by(|a, b| b.1.cmp(&a.1).then_with(|| b.2.cmp(&a.2)));
-    dirs.truncate(10);
-    stats.top_directories = dirs;
+    stats.top_directories = top_directories(dirs, 10);
     stats
 }
 
+/// The `limit` busiest directories, by sessions then messages, ties by name.
+/// Only the kept entries are fully sorted: partitioning first keeps this
+/// linear in the number of distinct directories.
+fn top_directories(
+    mut dirs: Vec<(String, usize, usize)>,
+    limit: usize,
+) -> Vec<(String, usize, usize)> {
+    let busiest_first = |a: &(String, usize, usize), b: &(String, usize, usize)| {
+        b.1.cmp(&a.1)
+            .then_with(|| b.2.cmp(&a.2))
+            .then_with(|| a.0.cmp(&b.0))
+    };
+    if dirs.len() > limit {
+        dirs.select_nth_unstable_by(limit, busiest_first);
+        dirs.truncate(limit);
+    }
+    dirs.sort_unstable_by(busiest_first);
+    dirs
+}
+
+/// Agents repeat across every session, so a key is allocated only the first
+/// time an agent is seen rather than three times per session.
+fn add_to<V: AddAssign>(totals: &mut BTreeMap<String, V>, key: &str, value: V) {
+    match totals.get_mut(key) {
+        Some(total) => *total += value,
+        None => {
+            totals.insert(key.to_string(), value);
+        }
+    }
+}
+
 fn index_size(path: &Path) -> u64 {
     if !path.exists() {
         return 0;
@@ -88,8 +117,31 @@ fn index_size(path: &Path) -> u64 {
     walkdir::WalkDir::new(path)
         .into_iter()
         .filter_map(Result::ok)
-        .filter_map(|entry| entry.path().metadata().ok())
-        .filter(|meta| meta.is_file())
+        .filter(|entry| entry.file_type().is_file())
+        .filter_map(|entry| entry.metadata().ok())
         .map(|meta| meta.len())
         .sum()
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn top_directories_keeps_busiest_in_order() {
+        let dirs = vec![
+            ("/c".to_string(), 1, 9),
+            ("/a".to_string(), 3, 1),
+            ("/b".to_string(), 3, 1),
+            ("/d".to_string(), 3, 5),
+            ("/e".to_string(), 2, 0),
+        ];
+
+        let top: Vec<_> = top_directories(dirs, 3)
+            .into_iter()
+            .map(|(dir, _, _)| dir)
+            .collect();
+
+        assert_eq!(top, vec!["/d", "/a", "/b"]);
+    }
+}
@@ -13,6 +13,7 @@ use fast_resume::output::{DEFAULT_LIST_LIMIT, print_sessions_json, print_session
 use fast_resume::search::SearchEngine;
 use fast_resume::stats::print_stats;
 use fast_resume::tui::{TuiExit, run_tui};
+use rayon::prelude::*;
 
 #[derive(Copy, Clone, Debug, Eq, PartialEq, ValueEnum)]
 enum ImageProtocolArg {
@@ -127,8 +128,9 @@ fn main() -> Result<()> {
             println!("No sessions indexed.");
             return Ok(());
         }
+        // Each adapter walks its own data directory, so walk them concurrently.
         let raw_stats: Vec<_> = all_adapters()
-            .into_iter()
+            .into_par_iter()
             .filter(|adapter| {
                 args.agent
                     .as_deref()
@@ -153,7 +155,7 @@ fn main() -> Result<()> {
             args.limit.unwrap_or(DEFAULT_LIST_LIMIT)
         };
         let results = engine
-            .search_result_with_offset(
+            .list_result_with_offset(
                 &query,
                 args.agent.as_deref(),
                 args.directory.as_deref(),
@@ -164,7 +166,7 @@ fn main() -> Result<()> {
         if args.json {
             print_sessions_json(&results, total, offset, limit, args.yolo)?;
         } else {
-            print_sessions_table(&results, total, offset);
+            print_sessions_table(&results, total, offset)?;
         }
         return Ok(());
     }
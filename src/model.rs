@@ -1,10 +1,16 @@
 use std::collections::HashMap;
+use std::collections::hash_map::Entry;
 use std::env;
 use std::path::Path;
 
 use chrono::{DateTime, Local};
+use once_cell::sync::Lazy;
 use serde::{Deserialize, Serialize};
 
+/// `$HOME`, read once: directories are abbreviated for every listed row and
+/// every rendered frame.
+static HOME: Lazy<String> = Lazy::new(|| env::var("HOME").unwrap_or_default());
+
 #[derive(Debug, Clone, Serialize, Deserialize, PartialEq)]
 pub struct Session {
     pub id: String,
@@ -42,9 +48,13 @@ impl Session {
     }
 
     pub fn display_directory(&self) -> String {
-        let home = env::var("HOME").unwrap_or_default();
-        if !home.is_empty() && self.directory.starts_with(&home) {
-            format!("~{}", &self.directory[home.len()..])
+        let home = HOME.as_str();
+        if let Some(rest) = self
+            .directory
+            .strip_prefix(home)
+            .filter(|_| !home.is_empty())
+        {
+            format!("~{rest}")
         } else if self.directory.is_empty() {
             "n/a".to_string()
         } else {
@@ -64,14 +74,16 @@ pub struct RawAdapterStats {
 
 pub fn truncate_title(text: &str, max_len: usize, word_break: bool) -> String {
     let text = text.trim();
-    if text.chars().count() <= max_len {
+    let Some((end, _)) = text.char_indices().nth(max_len) else {
         return text.to_string();
-    }
+    };
 
-    let mut truncated: String = text.chars().take(max_len).collect();
-    if word_break && let Some((prefix, _)) = truncated.rsplit_once(' ') {
-        truncated = prefix.to_string();
+    let mut prefix = &text[..end];
+    if word_break && let Some((before_space, _)) = prefix.rsplit_once(' ') {
+        prefix = before_space;
     }
+    let mut truncated = String::with_capacity(prefix.len() + 3);
+    truncated.push_str(prefix);
     truncated.push_str("...");
     truncated
 }
@@ -93,21 +105,69 @@ pub fn file_timestamp(path: &Path) -> DateTime<Local> {
 }
 
 pub fn sort_and_dedupe_sessions(sessions: Vec<Session>) -> Vec<Session> {
-    let mut by_key: HashMap<(String, String), Session> = HashMap::new();
+    let mut by_key: HashMap<(String, String), Session> = HashMap::with_capacity(sessions.len());
     for session in sessions {
-        let key = (session.agent.clone(), session.id.clone());
-        match by_key.get(&key) {
-            Some(existing)
-                if existing.mtime >= session.mtime
-                    && existing.timestamp >= session.timestamp
-                    && existing.content.len() >= session.content.len() => {}
-            _ => {
-                by_key.insert(key, session);
+        match by_key.entry((session.agent.clone(), session.id.clone())) {
+            Entry::Occupied(mut entry) => {
+                let existing = entry.get();
+                if existing.mtime < session.mtime
+                    || existing.timestamp < session.timestamp
+                    || existing.content.len() < session.content.len()
+                {
+                    entry.insert(session);
+                }
+            }
+            Entry::Vacant(entry) => {
+                entry.insert(session);
             }
         }
     }
 
+    // Map order is arbitrary already, so a stable sort would preserve nothing.
     let mut sessions: Vec<_> = by_key.into_values().collect();
-    sessions.sort_by_key(|session| std::cmp::Reverse(session.timestamp));
+    sessions.sort_unstable_by_key(|session| std::cmp::Reverse(session.timestamp));
     sessions
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn truncate_title_cuts_at_char_limit_and_word_boundary() {
+        assert_eq!(truncate_title("  short title  ", 20, true), "short title");
+        assert_eq!(truncate_title("fix the flaky test", 12, true), "fix the...");
+        assert_eq!(
+            truncate_title("fix the flaky test", 12, false),
+            "fix the flak..."
+        );
+        assert_eq!(truncate_title("héllo wörld", 5, false), "héllo...");
+        assert_eq!(truncate_title("héllo", 5, true), "héllo");
+    }
+
+    #[test]
+    fn sort_and_dedupe_keeps_newest_copy_newest_first() {
+        let now = Local::now();
+        let older = Session::new(
+            "a",
+            "codex",
+            "Old",
+            "/w",
+            now - chrono::Duration::hours(2),
+            "x",
+            1,
+        );
+        let mut newer = older.clone();
+        newer.title = "New".to_string();
+        newer.mtime = 1.0;
+        let other = Session::new("a", "claude", "Other", "/w", now, "y", 1);
+
+        let sessions = sort_and_dedupe_sessions(vec![newer, other, older]);
+
+        let keys: Vec<_> = sessions
+            .iter()
+            .map(|session| (session.agent.as_str(), session.title.as_str()))
+            .collect();
+        assert_eq!(keys, vec![("claude", "Other"), ("codex", "New")]);
+    }
+}
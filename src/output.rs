@@ -1,4 +1,5 @@
-use std::io::{self, Write};
+use std::borrow::Cow;
+use std::io::{self, BufWriter, Write};
 
 use anyhow::Result;
 use serde::Serialize;
@@ -94,55 +95,71 @@ pub fn print_sessions_json(
         },
     };
 
+    // serde_json emits many small writes and a single trailing newline, so a
+    // bare stdout lock would flush its small line buffer every time it fills.
     let stdout = io::stdout();
-    let mut writer = stdout.lock();
+    let mut writer = BufWriter::new(stdout.lock());
     serde_json::to_writer(&mut writer, &output)?;
     writeln!(writer)?;
+    writer.flush()?;
     Ok(())
 }
 
-pub fn print_sessions_table(sessions: &[Session], total: usize, offset: usize) {
+pub fn print_sessions_table(sessions: &[Session], total: usize, offset: usize) -> Result<()> {
+    let stdout = io::stdout();
+    let mut writer = BufWriter::new(stdout.lock());
     if sessions.is_empty() {
-        println!("No sessions found.");
-        return;
+        writeln!(writer, "No sessions found.")?;
+        writer.flush()?;
+        return Ok(());
     }
 
-    println!("{:<15}  {:<52}  {:<38}  ID", "Agent", "Title", "Directory");
-    println!("{}", "-".repeat(124));
+    writeln!(
+        writer,
+        "{:<15}  {:<52}  {:<38}  ID",
+        "Agent", "Title", "Directory"
+    )?;
+    writeln!(writer, "{}", "-".repeat(124))?;
     for session in sessions {
-        println!(
+        writeln!(
+            writer,
             "{:<15}  {:<52}  {:<38}  {}",
             session.agent,
             truncate_for_terminal(&session.title, 52),
             truncate_for_terminal(&session.display_directory(), 38),
             session.id
-        );
+        )?;
     }
 
     if offset == 0 {
-        println!("\nShowing {} of {} sessions", sessions.len(), total);
+        writeln!(writer, "\nShowing {} of {} sessions", sessions.len(), total)?;
     } else {
-        println!(
+        writeln!(
+            writer,
             "\nShowing {}-{} of {} sessions",
             offset + 1,
             offset + sessions.len(),
             total
-        );
+        )?;
     }
+    writer.flush()?;
     let next_offset = offset + sessions.len();
     if next_offset < total {
         eprintln!("More sessions available; continue with --offset {next_offset}");
     }
+    Ok(())
 }
 
-fn truncate_for_terminal(value: &str, width: usize) -> String {
-    if value.chars().count() <= width {
-        return value.to_string();
+fn truncate_for_terminal(value: &str, width: usize) -> Cow<'_, str> {
+    if value.char_indices().nth(width).is_none() {
+        return Cow::Borrowed(value);
     }
     let keep = width.saturating_sub(3);
-    let mut out: String = value.chars().take(keep).collect();
-    out.push_str("...");
-    out
+    let end = value
+        .char_indices()
+        .nth(keep)
+        .map_or(value.len(), |(i, _)| i);
+    Cow::Owned(format!("{}...", &value[..end]))
 }
 
 #[cfg(test)]
@@ -176,4 +193,13 @@ mod tests {
         assert!(json["sessions"][0].get("mtime").is_none());
         assert!(json["sessions"][0].get("yolo").is_none());
     }
+
+    #[test]
+    fn truncate_for_terminal_borrows_short_values() {
+        assert!(matches!(
+            truncate_for_terminal("short", 5),
+            Cow::Borrowed("short")
+        ));
+        assert_eq!(truncate_for_terminal("résumé title", 8), "résum...");
+    }
 }
@@ -41,12 +41,11 @@ impl Filter {
             return true;
         }
 
-        let matches_one = |needle: &str| {
-            if substring {
-                value.to_lowercase().contains(&needle.to_lowercase())
-            } else {
-                value == needle
-            }
+        // Lowercase the value once rather than once per needle.
+        let value_lower = substring.then(|| value.to_lowercase());
+        let matches_one = |needle: &str| match &value_lower {
+            Some(value_lower) => value_lower.contains(&needle.to_lowercase()),
+            None => value == needle,
         };
 
         if self.exclude.iter().any(|value| matches_one(value)) {
@@ -255,6 +254,15 @@ mod tests {
         assert_eq!(parsed.text, "api");
     }
 
+    #[test]
+    fn filter_matches_directory_substrings_case_insensitively() {
+        let filter = parse_query("dir:API,!Legacy").directory.unwrap();
+        assert!(filter.matches("/work/my-api", true));
+        assert!(!filter.matches("/work/legacy-api", true));
+        assert!(!filter.matches("/work/web", true));
+        assert!(!filter.matches("/work/my-api", false));
+    }
+
     #[test]
     fn parses_date_aliases() {
         assert!(parse_query("date:today").date.is_some());
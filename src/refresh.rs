@@ -124,8 +124,8 @@ where
                     updater.delete_sessions(agent, &deleted_ids)?;
                     deleted += deleted_ids.len();
                     let agent = agent.to_string();
-                    for id in &deleted_ids {
-                        if known_keys.remove(&(agent.clone(), id.clone())) {
+                    for id in deleted_ids {
+                        if known_keys.remove(&(agent.clone(), id)) {
                             total_sessions = total_sessions.saturating_sub(1);
                         }
                     }
@@ -175,14 +175,13 @@ where
         return Ok(());
     }
 
-    updater.update_sessions(batch)?;
     *changed += batch.len();
     for session in batch.iter() {
         if known_keys.insert((session.agent.clone(), session.id.clone())) {
             *total_sessions += 1;
         }
     }
-    batch.clear();
+    updater.update_sessions(std::mem::take(batch))?;
     on_progress(RefreshSummary {
         sessions: *total_sessions,
         new_or_modified: *changed,
@@ -46,6 +46,10 @@ impl SearchEngine {
         self.index.count_for_agent(agent).unwrap_or(0)
     }
 
+    pub fn session_content(&self, agent: &str, id: &str) -> Option<String> {
+        self.index.session_content(agent, id).ok().flatten()
+    }
+
     pub fn agents_with_sessions(&self) -> Vec<String> {
         self.index.agents_with_sessions().unwrap_or_default()
     }
@@ -94,6 +98,21 @@ impl SearchEngine {
             .search_with_offset(query, agent_filter, directory_filter, offset, limit)
             .map(|hits| hits.into_iter().map(|hit| hit.session).collect())
     }
+
+    /// `search_result_with_offset` without conversation content, for output
+    /// that only lists sessions.
+    pub fn list_result_with_offset(
+        &self,
+        query: &str,
+        agent_filter: Option<&str>,
+        directory_filter: Option<&str>,
+        offset: usize,
+        limit: usize,
+    ) -> Result<Vec<Session>> {
+        self.index
+            .list_with_offset(query, agent_filter, directory_filter, offset, limit)
+            .map(|hits| hits.into_iter().map(|hit| hit.session).collect())
+    }
 }
 
 #[cfg(test)]
@@ -142,6 +161,34 @@ mod tests {
         assert_eq!(engine.search("", None, None, 10).len(), 2);
     }
 
+    #[test]
+    fn listing_matches_search_without_content() {
+        let temp = tempdir().unwrap();
+        let index = SessionIndex::open(temp.path().join("index")).unwrap();
+        index
+            .rebuild(vec![
+                session("a", "claude", "Auth bug", "/work/api", "token"),
+                session("b", "codex", "Other", "/work/b", "token button"),
+            ])
+            .unwrap();
+        let engine = SearchEngine::from_index(index);
+
+        let searched = engine
+            .search_result_with_offset("token", None, None, 0, 10)
+            .unwrap();
+        let listed = engine
+            .list_result_with_offset("token", None, None, 0, 10)
+            .unwrap();
+
+        assert_eq!(listed.len(), 2);
+        for (listed, searched) in listed.iter().zip(&searched) {
+            assert_eq!(listed.id, searched.id);
+            assert_eq!(listed.title, searched.title);
+            assert!(!searched.content.is_empty());
+            assert!(listed.content.is_empty());
+        }
+    }
+
     #[test]
     fn filters_by_agent_and_directory_keyword() {
         let temp = tempdir().unwrap();
@@ -158,6 +205,24 @@ mod tests {
         assert_eq!(results[0].id, "a");
     }
 
+    #[test]
+    fn directory_keyword_accepts_several_includes_and_excludes() {
+        let temp = tempdir().unwrap();
+        let index = SessionIndex::open(temp.path().join("index")).unwrap();
+        index
+            .rebuild(vec![
+                session("a", "claude", "One", "/work/API", "x"),
+                session("b", "codex", "Two", "/work/web", "x"),
+                session("c", "codex", "Three", "/work/web-legacy", "x"),
+                session("d", "codex", "Four", "/work/docs", "x"),
+            ])
+            .unwrap();
+        let engine = SearchEngine::from_index(index);
+
+        assert_eq!(result_ids(&engine, "dir:api,web,!legacy"), vec!["a", "b"]);
+        assert_eq!(result_ids(&engine, "-dir:api,legacy"), vec!["b", "d"]);
+    }
+
     #[test]
     fn plain_text_search_matches_directory_substrings() {
         let temp = tempdir().unwrap();
@@ -212,10 +212,11 @@ fn run_search(engine: &mut SearchEngine, request: SearchRequest) -> SearchResult
         if request.reload_index {
             engine.reload()?;
         }
-        engine.search_result(
+        engine.list_result_with_offset(
             &request.query,
             request.agent_filter.as_deref(),
             request.directory_filter.as_deref(),
+            0,
             100,
         )
     })()
@@ -417,6 +418,18 @@ mod tests {
         assert!(format!("{refreshed:?}").contains("second version"));
     }
 
+    #[test]
+    fn preview_loads_content_of_listed_sessions() {
+        let mut stored = session("listed-1");
+        stored.content = "only in the stored conversation".to_string();
+        let state = test_state(vec![stored]);
+        let listed = state.selected_session().unwrap();
+        assert!(listed.content.is_empty());
+
+        let lines = state.preview_lines(listed);
+        assert!(format!("{lines:?}").contains("only in the stored conversation"));
+    }
+
     #[test]
     fn pending_search_requests_coalesce_to_latest() {
         let (tx, rx) = std::sync::mpsc::channel();
@@ -993,6 +1006,24 @@ mod tests {
         assert_eq!(state.selected_session().unwrap().id, "b");
     }
 
+    #[test]
+    fn finished_refresh_reloads_once_before_searching() {
+        let mut state = test_state(vec![session("a")]);
+
+        super::state::handle_scan_message(
+            &mut state,
+            super::state::ScanMessage::Finished {
+                elapsed: Duration::ZERO,
+                new_or_modified: 0,
+                deleted: 0,
+                total: 1,
+            },
+        );
+
+        let request = state.take_search_request().unwrap();
+        assert!(!request.reload_index);
+    }
+
     #[test]
     fn refresh_messages_do_not_overwrite_footer_status() {
         let mut state = test_state(vec![session("a")]);
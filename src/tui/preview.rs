@@ -1,15 +1,17 @@
+use std::borrow::Cow;
+
 use ratatui::style::{Color, Style};
 use ratatui::text::{Line, Span};
+use regex::Regex;
 
 use crate::config::AGENTS;
 use crate::model::Session;
 
-pub(super) fn render_preview_lines(session: &Session, query: &str) -> Vec<Line<'static>> {
-    let snippet = preview_snippet(session, query);
+pub(super) fn render_preview_lines(session: &Session, terms: &PreviewTerms) -> Vec<Line<'static>> {
+    let snippet = preview_snippet(session, terms);
     let agent = AGENTS.get(session.agent.as_str());
     let agent_label = agent.map(|agent| agent.badge).unwrap_or(&session.agent);
     let agent_color = agent.map(|agent| agent.color).unwrap_or(Color::White);
-    let terms = preview_terms(query);
 
     let mut lines = Vec::new();
     for message in snippet.split("\n\n") {
@@ -19,30 +21,20 @@ pub(super) fn render_preview_lines(session: &Session, query: &str) -> Vec<Line<'
         if !lines.is_empty() {
             lines.push(Line::raw(""));
         }
-        render_preview_message(&mut lines, message, agent_label, agent_color, &terms);
+        render_preview_message(&mut lines, message, agent_label, agent_color, terms);
     }
     lines
 }
 
-fn preview_snippet(session: &Session, query: &str) -> String {
-    if query.trim().is_empty() {
-        return truncate_chars(&session.content, 6_000);
-    }
-
-    let terms = preview_terms(query);
-    if terms.is_empty() {
-        return truncate_chars(&session.content, 6_000);
-    }
-
-    let content_lc = session.content.to_ascii_lowercase();
-    let mut best = None;
-    for term in &terms {
-        if let Some(pos) = content_lc.find(term.as_str()) {
-            best = Some(best.map_or(pos, |current: usize| current.min(pos)));
-        }
-    }
-
-    if let Some(pos) = best {
+/// Opens the preview just before the first hit of any term. The matcher scans
+/// the content in place and stops there, where lowercasing a copy of the whole
+/// conversation and searching it once per term cost a full pass each.
+fn preview_snippet<'a>(session: &'a Session, terms: &PreviewTerms) -> Cow<'a, str> {
+    let first_hit = terms
+        .0
+        .as_ref()
+        .and_then(|matcher| matcher.find(&session.content));
+    if let Some(pos) = first_hit.map(|hit| hit.start()) {
         let start = session.content[..pos]
             .char_indices()
             .rev()
@@ -62,7 +54,7 @@ fn preview_snippet(session: &Session, query: &str) -> String {
         if end < session.content.len() {
             snippet.push_str("\n...");
         }
-        snippet
+        Cow::Owned(snippet)
     } else {
         truncate_chars(&session.content, 6_000)
     }
@@ -80,7 +72,7 @@ fn render_preview_message(
     message: &str,
     agent_label: &str,
     agent_color: Color,
-    terms: &[String],
+    terms: &PreviewTerms,
 ) {
     let role = preview_role(message);
     let mut in_code = false;
@@ -154,7 +146,7 @@ fn code_fence_language(line: &str) -> Option<&str> {
         .map(|language| language.split_whitespace().next().unwrap_or_default())
 }
 
-fn render_user_line(line: &str, terms: &[String], first: bool) -> Line<'static> {
+fn render_user_line(line: &str, terms: &PreviewTerms, first: bool) -> Line<'static> {
     let mut spans = Vec::new();
     if first {
         spans.push(Span::styled(
@@ -179,7 +171,7 @@ fn render_user_line(line: &str, terms: &[String], first: bool) -> Line<'static>
 
 fn render_agent_line(
     line: &str,
-    terms: &[String],
+    terms: &PreviewTerms,
     agent_label: &str,
     agent_color: Color,
     first: bool,
@@ -206,7 +198,7 @@ fn render_agent_line(
     Line::from(spans)
 }
 
-fn render_plain_preview_line(line: &str, terms: &[String]) -> Line<'static> {
+fn render_plain_preview_line(line: &str, terms: &PreviewTerms) -> Line<'static> {
     let style = if line.starts_with("...") {
         Style::new().fg(Color::DarkGray).italic()
     } else {
@@ -250,7 +242,7 @@ fn render_code_fence_line(
     Line::from(spans)
 }
 
-fn render_code_line(line: &str, language: &str, terms: &[String]) -> Line<'static> {
+fn render_code_line(line: &str, language: &str, terms: &PreviewTerms) -> Line<'static> {
     let mut spans = vec![Span::styled(
         "    ".to_string(),
         Style::new().fg(Color::DarkGray),
@@ -413,32 +405,22 @@ fn take_while_len(value: &str, mut predicate: impl FnMut(char) -> bool) -> usize
         .unwrap_or(value.len())
 }
 
-fn highlight_spans(spans: Vec<Span<'static>>, terms: &[String]) -> Vec<Span<'static>> {
-    if terms.is_empty() {
+fn highlight_spans(spans: Vec<Span<'static>>, terms: &PreviewTerms) -> Vec<Span<'static>> {
+    let Some(matcher) = &terms.0 else {
         return spans;
-    }
+    };
 
     let mut highlighted = Vec::new();
     for span in spans {
         let text = span.content.into_owned();
-        let lower = text.to_ascii_lowercase();
         let mut idx = 0usize;
-        while idx < text.len() {
-            let next = terms
-                .iter()
-                .filter(|term| !term.is_empty())
-                .filter_map(|term| lower[idx..].find(term).map(|pos| (idx + pos, term.len())))
-                .min_by_key(|(pos, _)| *pos);
-            let Some((hit, len)) = next else {
-                highlighted.push(Span::styled(text[idx..].to_string(), span.style));
-                break;
-            };
-            if hit > idx {
-                highlighted.push(Span::styled(text[idx..hit].to_string(), span.style));
+        for hit in matcher.find_iter(&text) {
+            if hit.start() > idx {
+                highlighted.push(Span::styled(text[idx..hit.start()].to_string(), span.style));
             }
-            let end = (hit + len).min(text.len());
+            let end = hit.end();
             highlighted.push(Span::styled(
-                text[hit..end].to_string(),
+                text[hit.start()..end].to_string(),
                 Style::new()
                     .fg(Color::Black)
                     .bg(Color::Rgb(250, 220, 110))
@@ -446,10 +428,30 @@ fn highlight_spans(spans: Vec<Span<'static>>, terms: &[String]) -> Vec<Span<'sta
             ));
             idx = end;
         }
+        if idx < text.len() {
+            highlighted.push(Span::styled(text[idx..].to_string(), span.style));
+        }
     }
     highlighted
 }
 
+/// The query's terms compiled into one alternation, matched ASCII
+/// case-insensitively, so each line is scanned once for all of them instead
+/// of lowercased and searched again per term after every hit. At a given
+/// position the earliest-listed term wins, as before.
+pub(super) struct PreviewTerms(Option<Regex>);
+
+impl PreviewTerms {
+    pub(super) fn new(query: &str) -> Self {
+        let terms = preview_terms(query);
+        if terms.is_empty() {
+            return Self(None);
+        }
+        let alternatives: Vec<_> = terms.iter().map(|term| regex::escape(term)).collect();
+        Self(Regex::new(&format!("(?i-u){}", alternatives.join("|"))).ok())
+    }
+}
+
 fn preview_terms(query: &str) -> Vec<String> {
     query
         .split_whitespace()
@@ -466,13 +468,14 @@ fn is_search_filter_token(token: &str) -> bool {
         .any(|prefix| token.starts_with(prefix))
 }
 
-fn truncate_chars(value: &str, max: usize) -> String {
-    if value.chars().count() <= max {
-        return value.to_string();
+/// The preview is a prefix of the session content, so short content is
+/// borrowed as is and long content is cut at the `max`th char without
+/// counting the rest of it.
+fn truncate_chars(value: &str, max: usize) -> Cow<'_, str> {
+    match value.char_indices().nth(max) {
+        Some((end, _)) => Cow::Owned(format!("{}\n...", &value[..end])),
+        None => Cow::Borrowed(value),
     }
-    let mut out: String = value.chars().take(max).collect();
-    out.push_str("\n...");
-    out
 }
 
 #[cfg(test)]
@@ -507,13 +510,19 @@ mod tests {
             .join("\n")
     }
 
+    #[test]
+    fn truncate_chars_borrows_short_content_and_cuts_long_content() {
+        assert!(matches!(truncate_chars("héllo", 5), Cow::Borrowed("héllo")));
+        assert_eq!(truncate_chars("héllo", 2), "hé\n...");
+    }
+
     #[test]
     fn preview_lines_render_roles_and_code_blocks() {
         let session = session_with_content(
             "» show rust\n\n  ```rust\n#[derive(Debug)]\nfn main() {\n    let answer = 42;\n}\n```\nLooks good",
         );
 
-        let lines = render_preview_lines(&session, "");
+        let lines = render_preview_lines(&session, &PreviewTerms::new(""));
         let rendered = rendered_text(&lines);
 
         assert!(rendered.contains("» show rust"));
@@ -537,11 +546,47 @@ mod tests {
         assert_eq!(hash.style.fg, Some(Color::DarkGray));
     }
 
+    #[test]
+    fn snippet_starts_near_the_first_case_insensitive_hit() {
+        let content = format!("{}\n\nthe Needle is here", "filler ".repeat(100));
+        let session = session_with_content(&content);
+
+        let snippet = preview_snippet(&session, &PreviewTerms::new("missing needle"));
+
+        assert!(snippet.starts_with("...\n"));
+        assert!(snippet.ends_with("the Needle is here"));
+        assert!(snippet.len() < content.len());
+    }
+
+    #[test]
+    fn highlight_marks_every_term_case_insensitively_in_one_pass() {
+        let terms = PreviewTerms::new("token AUTH");
+        let spans = highlight_spans(vec![Span::raw("Auth token, auth-Token.")], &terms);
+
+        let parts: Vec<_> = spans
+            .iter()
+            .map(|span| (span.content.as_ref(), span.style.bg.is_some()))
+            .collect();
+        assert_eq!(
+            parts,
+            vec![
+                ("Auth", true),
+                (" ", false),
+                ("token", true),
+                (", ", false),
+                ("auth", true),
+                ("-", false),
+                ("Token", true),
+                (".", false),
+            ]
+        );
+    }
+
     #[test]
     fn preview_highlights_matches_inside_code_but_ignores_filter_tokens() {
         let session = session_with_content("» inspect\n\n  ```rust\nfn main() {}\n```");
 
-        let lines = render_preview_lines(&session, "agent:codex main");
+        let lines = render_preview_lines(&session, &PreviewTerms::new("agent:codex main"));
 
         let highlighted = lines
             .iter()
@@ -7,7 +7,7 @@ use crate::query::{Filter, parse_query};
 use crate::search::SearchEngine;
 
 use super::images::AgentImages;
-use super::preview::render_preview_lines;
+use super::preview::{PreviewTerms, render_preview_lines};
 use super::text::char_to_byte_idx;
 
 const DATE_SUGGESTIONS: [&str; 4] = ["today", "yesterday", "week", "month"];
@@ -59,6 +59,7 @@ struct PreviewCache {
     session_id: String,
     mtime: f64,
     query: String,
+    terms: PreviewTerms,
     lines: Vec<ratatui::text::Line<'static>>,
 }
 
@@ -88,9 +89,12 @@ pub(super) struct AppState {
 }
 
 impl AppState {
-    /// Rendering the preview lowercases and highlights the full session
-    /// content, so the result is cached per (session, mtime, query) instead
-    /// of being recomputed on every frame while the user types.
+    /// Rendering the preview scans and highlights the session content, so the
+    /// result is cached per (session, mtime, query) instead of being
+    /// recomputed on every frame while the user types. The compiled query
+    /// terms outlive a selection change, which keeps the query unchanged.
+    /// Search results are listed without their content, so it is loaded here
+    /// for the one session being previewed.
     pub(super) fn preview_lines(&self, session: &Session) -> Vec<ratatui::text::Line<'static>> {
         let mut cache = self.preview_cache.borrow_mut();
         if let Some(cached) = cache.as_ref()
@@ -100,11 +104,28 @@ impl AppState {
         {
             return cached.lines.clone();
         }
-        let lines = render_preview_lines(session, &self.query);
+        let terms = match cache.take() {
+            Some(cached) if cached.query == self.query => cached.terms,
+            _ => PreviewTerms::new(&self.query),
+        };
+        let loaded;
+        let previewed = if session.content.is_empty()
+            && let Some(content) = self.engine.session_content(&session.agent, &session.id)
+        {
+            loaded = Session {
+                content,
+                ..session.clone()
+            };
+            &loaded
+        } else {
+            session
+        };
+        let lines = render_preview_lines(previewed, &terms);
         *cache = Some(PreviewCache {
             session_id: session.id.clone(),
             mtime: session.mtime,
             query: self.query.clone(),
+            terms,
             lines: lines.clone(),
         });
         lines
@@ -162,12 +183,16 @@ impl AppState {
         let start = Instant::now();
         let agent_filter = self.effective_agent_filter();
         let directory_filter = self.effective_directory_filter();
-        self.visible = self.engine.search(
-            &self.query,
-            agent_filter.as_deref(),
-            directory_filter.as_deref(),
-            100,
-        );
+        self.visible = self
+            .engine
+            .list_result_with_offset(
+                &self.query,
+                agent_filter.as_deref(),
+                directory_filter.as_deref(),
+                0,
+                100,
+            )
+            .unwrap_or_default();
         self.last_search_ms = start.elapsed().as_secs_f64() * 1000.0;
         self.update_selection_after_search(selected_session.as_ref());
         self.preview_scroll = 0;
@@ -577,11 +602,13 @@ pub(super) fn handle_scan_message(state: &mut AppState, message: ScanMessage) {
             deleted,
             total,
         } => {
+            // Every clone of the engine shares one reader, so this reload also
+            // serves the search worker; its follow-up search need not repeat it.
             let _ = state.engine.reload();
             state.scanning = false;
             state.refresh_status =
                 refresh_status("refreshed", total, new_or_modified, deleted, elapsed);
-            state.request_search_preserving_selection(true);
+            state.request_search_preserving_selection(false);
         }
         ScanMessage::Failed { elapsed, error } => {
             state.scanning = false;